@@ -0,0 +1,157 @@
+class ComponentGraph(object):
+    """ Which glyphs use which glyphs as components, in one font.
+
+        Built once from a font, then kept up to date with updateGlyph()
+        when a glyph changes, so the whole font does not need to be read again.
+        The transitive lookups are cached until the graph changes.
+    """
+
+    def __init__(self):
+        # glyph name: set of the base glyph names of its components
+        self.components = {}
+        # base glyph name: set of the glyph names that use it as a component
+        self.reverseComponents = {}
+        # glyph name: frozenset of all the glyphs that use it, also through other components
+        self._dependentsCache = {}
+        # glyph name: frozenset of all the base glyphs it needs, also for components of components
+        self._baseGlyphsCache = {}
+
+    @classmethod
+    def fromReverseComponentMapping(cls, reverseComponentMapping):
+        # reverseComponentMapping: dict with base glyph name: glyph names that use it
+        graph = cls()
+        for baseGlyphName, glyphNames in reverseComponentMapping.items():
+            graph.reverseComponents[baseGlyphName] = set(glyphNames)
+            for glyphName in glyphNames:
+                if glyphName not in graph.components:
+                    graph.components[glyphName] = set()
+                graph.components[glyphName].add(baseGlyphName)
+        return graph
+
+    def updateGlyph(self, glyphName, baseGlyphNames):
+        """ Set the base glyph names of the components of this glyph. """
+        baseGlyphNames = set(baseGlyphNames)
+        previous = self.components.get(glyphName, set())
+        if baseGlyphNames == previous:
+            return
+        for baseGlyphName in previous - baseGlyphNames:
+            users = self.reverseComponents.get(baseGlyphName)
+            if users is not None:
+                users.discard(glyphName)
+                if not users:
+                    del self.reverseComponents[baseGlyphName]
+        for baseGlyphName in baseGlyphNames - previous:
+            if baseGlyphName not in self.reverseComponents:
+                self.reverseComponents[baseGlyphName] = set()
+            self.reverseComponents[baseGlyphName].add(glyphName)
+        if baseGlyphNames:
+            self.components[glyphName] = baseGlyphNames
+        else:
+            self.components.pop(glyphName, None)
+        self._dependentsCache.clear()
+        self._baseGlyphsCache.clear()
+
+    def removeGlyph(self, glyphName):
+        """ The glyph is no longer in the font. """
+        self.updateGlyph(glyphName, ())
+
+    def getDependents(self, glyphName):
+        """ Return all the glyphs that use this glyph as a component,
+            directly or as a component of a component.
+        """
+        dependents = self._dependentsCache.get(glyphName)
+        if dependents is None:
+            dependents = self._dependentsCache[glyphName] = self._closure(glyphName, self.reverseComponents)
+        return dependents
+
+    def getBaseGlyphs(self, glyphName):
+        """ Return all the base glyphs this glyph needs,
+            directly or as a component of a component.
+        """
+        baseGlyphNames = self._baseGlyphsCache.get(glyphName)
+        if baseGlyphNames is None:
+            baseGlyphNames = self._baseGlyphsCache[glyphName] = self._closure(glyphName, self.components)
+        return baseGlyphNames
+
+    def _closure(self, glyphName, edges):
+        found = set()
+        todo = [glyphName]
+        while todo:
+            for name in edges.get(todo.pop(), ()):
+                # the check also stops at cyclic references
+                if name not in found:
+                    found.add(name)
+                    todo.append(name)
+        found.discard(glyphName)
+        return frozenset(found)
+
+    def findCycles(self):
+        """ Return a list of sets of glyph names that refer to each other as components.
+            A glyph that uses itself as a component is a cycle as well.
+        """
+        # Tarjan's strongly connected components, without recursion
+        index = {}
+        lowLink = {}
+        stack = []
+        onStack = set()
+        cycles = []
+        for startName in sorted(self.components):
+            if startName in index:
+                continue
+            work = [(startName, iter(sorted(self.components.get(startName, ()))))]
+            index[startName] = lowLink[startName] = len(index)
+            stack.append(startName)
+            onStack.add(startName)
+            while work:
+                glyphName, baseGlyphNames = work[-1]
+                for baseGlyphName in baseGlyphNames:
+                    if baseGlyphName not in index:
+                        index[baseGlyphName] = lowLink[baseGlyphName] = len(index)
+                        stack.append(baseGlyphName)
+                        onStack.add(baseGlyphName)
+                        work.append((baseGlyphName, iter(sorted(self.components.get(baseGlyphName, ())))))
+                        break
+                    if baseGlyphName in onStack:
+                        lowLink[glyphName] = min(lowLink[glyphName], index[baseGlyphName])
+                else:
+                    work.pop()
+                    if work:
+                        parentName = work[-1][0]
+                        lowLink[parentName] = min(lowLink[parentName], lowLink[glyphName])
+                    if lowLink[glyphName] == index[glyphName]:
+                        group = set()
+                        while True:
+                            name = stack.pop()
+                            onStack.discard(name)
+                            group.add(name)
+                            if name == glyphName:
+                                break
+                        if len(group) > 1 or glyphName in self.components.get(glyphName, ()):
+                            cycles.append(group)
+        return cycles
+
+    def topologicalOrder(self, glyphNames):
+        """ Return glyphNames ordered so that base glyphs come before the glyphs that use them.
+            Otherwise the order of glyphNames is kept.
+            Glyphs in a cycle keep the order in which they are found.
+        """
+        wanted = set(glyphNames)
+        visited = set()
+        order = []
+        for startName in glyphNames:
+            if startName in visited:
+                continue
+            visited.add(startName)
+            work = [(startName, iter(sorted(self.components.get(startName, ()))))]
+            while work:
+                glyphName, baseGlyphNames = work[-1]
+                for baseGlyphName in baseGlyphNames:
+                    if baseGlyphName not in visited:
+                        visited.add(baseGlyphName)
+                        work.append((baseGlyphName, iter(sorted(self.components.get(baseGlyphName, ())))))
+                        break
+                else:
+                    work.pop()
+                    if glyphName in wanted:
+                        order.append(glyphName)
+        return order
@@ -0,0 +1,136 @@
+import os
+import pickle
+import hashlib
+import tempfile
+
+from fontTools.ufoLib import UFOReader
+
+
+# change this when the pickled mutators are no longer compatible
+mutatorCacheFormatVersion = 3
+
+
+def fileHash(path):
+    # return the hash of the data in this file, or None
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class GlifHashes(object):
+    """ Hashes of the .glif data of glyphs in UFOs on disk.
+        Each .glif file is read and hashed once, until clear() is called.
+    """
+
+    def __init__(self):
+        # (ufoPath, layerName): glyphSet, or None if the layer is not there
+        self._glyphSets = {}
+        # (ufoPath, layerName, glyphName): hash
+        self._hashes = {}
+
+    def glifHash(self, ufoPath, layerName, glyphName):
+        # return the hash of the .glif data for this glyph
+        # or None if the glyph is not there.
+        hashKey = (ufoPath, layerName, glyphName)
+        if hashKey in self._hashes:
+            return self._hashes[hashKey]
+        key = (ufoPath, layerName)
+        if key not in self._glyphSets:
+            reader = UFOReader(ufoPath, validate=False)
+            if layerName is None:
+                layerName = reader.getDefaultLayerName()
+            if layerName in reader.getLayerNames():
+                self._glyphSets[key] = reader.getGlyphSet(layerName, validateRead=False)
+            else:
+                self._glyphSets[key] = None
+        glyphSet = self._glyphSets[key]
+        if glyphSet is None or glyphName not in glyphSet:
+            glifHash = None
+        else:
+            glifHash = hashlib.sha256(glyphSet.getGLIF(glyphName)).hexdigest()
+        self._hashes[hashKey] = glifHash
+        return glifHash
+
+    def clear(self):
+        self._glyphSets.clear()
+        self._hashes.clear()
+
+    def removeGlyphs(self, glyphNames):
+        # read these glyphs again, in all UFOs
+        glyphNames = set(glyphNames)
+        for hashKey in [hashKey for hashKey in self._hashes if hashKey[2] in glyphNames]:
+            del self._hashes[hashKey]
+
+
+class MutatorCache(object):
+    """ A folder with pickled glyph mutators, so that a next run
+        with the same sources does not need to prepare the masters again.
+
+        The keys describe everything the mutator depends on,
+        including the contents of the .glif files in the sources.
+        So the .glif data is read from disk: the cache can't see
+        changes in fonts that have not been saved.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if not os.path.exists(self.path):
+            os.makedirs(self.path, exist_ok=True)
+        self.glifHashes = GlifHashes()
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # the glifHashes stay in this process
+        return dict(path=self.path)
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def glifHash(self, ufoPath, layerName, glyphName):
+        return self.glifHashes.glifHash(ufoPath, layerName, glyphName)
+
+    def clearGlyphSets(self):
+        # read the .glif files again.
+        self.glifHashes.clear()
+
+    def _pathForKey(self, key):
+        digest = hashlib.sha256(repr((mutatorCacheFormatVersion, key)).encode("utf-8")).hexdigest()
+        return os.path.join(self.path, f"{digest}.pickle")
+
+    def get(self, key):
+        # return the stored value for this key, or None
+        path = self._pathForKey(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except Exception:
+            # incomplete or from an incompatible version
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def store(self, key, value):
+        # write to a temporary file first, other processes might be reading.
+        path = self._pathForKey(key)
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return False
+        handle, tempPath = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(handle, "wb") as f:
+            f.write(data)
+        os.replace(tempPath, path)
+        return True
+
+    def clear(self):
+        # remove all the stored mutators
+        for fileName in os.listdir(self.path):
+            if fileName.endswith(".pickle"):
+                os.remove(os.path.join(self.path, fileName))
+        self.clearGlyphSets()
@@ -0,0 +1,161 @@
+import weakref
+
+import defcon
+
+
+class SourceObserver(object):
+    """ Observes the defcon notifications of the loaded source fonts of a UFOOperator.
+
+        An edited glyph only removes the mutators of that glyph, and of the glyphs
+        that use it as a component, from the cache. Its MathGlyphs are only made again
+        for the sources in which it changed. Changed kerning, groups, info and lib
+        only clear the kerning, info or lib mutators.
+
+        Use UFOOperator.startObservingSources() and stopObservingSources().
+        Fonts that are loaded or replaced later are observed as well.
+        Only defcon fonts, and fontParts fonts that wrap a defcon font, post notifications.
+    """
+
+    # notification: name of the font data for UFOOperator.fontDataChanged
+    fontDataNotifications = {
+        "Info.Changed": "info",
+        "Kerning.Changed": "kerning",
+        "Groups.Changed": "groups",
+        "Lib.Changed": "lib",
+        "Features.Changed": "features",
+    }
+    # notifications of glyphs that are added, removed or renamed in a layer
+    layerNotifications = ("Layer.GlyphAdded", "Layer.GlyphDeleted", "Layer.GlyphNameChanged")
+    # notifications of layers that are added, removed or renamed
+    layerSetNotifications = ("LayerSet.LayerAdded", "LayerSet.LayerDeleted", "LayerSet.DefaultLayerChanged", "Layer.NameChanged")
+
+    def __init__(self, operator):
+        # a weak reference, the operator keeps the observer
+        self._operator = weakref.ref(operator)
+        # source name: (defcon font, layer name of the source or None for the default layer)
+        self.fonts = {}
+
+    @property
+    def operator(self):
+        return self._operator()
+
+    def start(self):
+        # observe the fonts that are already loaded
+        for sourceName, font in list(self.operator.fonts.items()):
+            self.observeFont(sourceName, font)
+
+    def stop(self):
+        for sourceName in list(self.fonts):
+            self.unobserveFont(sourceName)
+
+    def _getDefconFont(self, font):
+        if isinstance(font, defcon.Font):
+            return font
+        if hasattr(font, "naked"):
+            font = font.naked()
+            if isinstance(font, defcon.Font):
+                return font
+        return None
+
+    def observeFont(self, sourceName, font):
+        # called by the operator when a source font is loaded or replaced
+        self.unobserveFont(sourceName)
+        font = self._getDefconFont(font)
+        if font is None:
+            return
+        layerName = None
+        for sourceDescriptor in self.operator.doc.sources:
+            if sourceDescriptor.name == sourceName:
+                layerName = sourceDescriptor.layerName
+                break
+        if not self._sourceNamesForFont(font):
+            # the first source with this font
+            dispatcher = font.dispatcher
+            dispatcher.addObserver(self, "_glyphChangedNotification", "Glyph.Changed", None)
+            for notification in self.layerNotifications:
+                dispatcher.addObserver(self, "_layerGlyphsChangedNotification", notification, None)
+            for notification in self.layerSetNotifications:
+                dispatcher.addObserver(self, "_layersChangedNotification", notification, None)
+            # the glyphs have a lib as well, only the font lib is observed
+            for notification, observable in self._fontDataObservables(font):
+                dispatcher.addObserver(self, "_fontDataChangedNotification", notification, observable)
+        self.fonts[sourceName] = (font, layerName)
+
+    def unobserveFont(self, sourceName):
+        if sourceName not in self.fonts:
+            return
+        font, _ = self.fonts.pop(sourceName)
+        if self._sourceNamesForFont(font):
+            # still used by other sources
+            return
+        dispatcher = font.dispatcher
+        dispatcher.removeObserver(self, "Glyph.Changed", None)
+        for notification in self.layerNotifications + self.layerSetNotifications:
+            dispatcher.removeObserver(self, notification, None)
+        for notification, observable in self._fontDataObservables(font):
+            dispatcher.removeObserver(self, notification, observable)
+
+    def _fontDataObservables(self, font):
+        return [
+            ("Info.Changed", font.info),
+            ("Kerning.Changed", font.kerning),
+            ("Groups.Changed", font.groups),
+            ("Lib.Changed", font.lib),
+            ("Features.Changed", font.features),
+        ]
+
+    def _sourceNamesForFont(self, font, layer=None):
+        # return the names of the sources that use this font,
+        # and this layer if it is given
+        sourceNames = []
+        for sourceName, (sourceFont, layerName) in self.fonts.items():
+            if sourceFont is not font:
+                continue
+            if layer is not None:
+                if layerName is None:
+                    layerName = font.layers.defaultLayer.name
+                if layer.name != layerName:
+                    continue
+            sourceNames.append(sourceName)
+        return sourceNames
+
+    # notifications
+
+    def _glyphChangedNotification(self, notification):
+        glyph = notification.object
+        layer = glyph.layer
+        if layer is None:
+            return
+        sourceNames = self._sourceNamesForFont(glyph.font, layer)
+        if sourceNames:
+            self.operator.glyphChanged(glyph.name, includeDependencies=True, sourceNames=sourceNames)
+
+    def _layerGlyphsChangedNotification(self, notification):
+        layer = notification.object
+        sourceNames = self._sourceNamesForFont(layer.font, layer)
+        if not sourceNames:
+            return
+        data = notification.data
+        if notification.name == "Layer.GlyphNameChanged":
+            glyphNames = [data["oldValue"], data["newValue"]]
+        else:
+            glyphNames = [data["name"]]
+        operator = self.operator
+        operator.glyphNames = operator._collectGlyphNames()
+        for glyphName in glyphNames:
+            operator.glyphChanged(glyphName, includeDependencies=True, sourceNames=sourceNames)
+
+    def _layersChangedNotification(self, notification):
+        # a source can have a different layer now: all its glyphs changed
+        font = notification.object.font
+        sourceNames = self._sourceNamesForFont(font)
+        operator = self.operator
+        operator.glyphNames = operator._collectGlyphNames()
+        glyphNames = set(operator.glyphNames)
+        for layer in font.layers:
+            glyphNames.update(layer.keys())
+        for glyphName in glyphNames:
+            operator.glyphChanged(glyphName, sourceNames=sourceNames)
+
+    def _fontDataChangedNotification(self, notification):
+        self.operator.fontDataChanged(self.fontDataNotifications[notification.name])
@@ -1,7 +1,13 @@
 import os
+import sys
 import functools
 import itertools
 import inspect
+import weakref
+import time
+import concurrent.futures
+import hashlib
+import json
 
 import random
 import defcon
@@ -11,7 +17,7 @@ import traceback
 
 from fontTools.designspaceLib import DesignSpaceDocument, processRules, InstanceDescriptor
 from fontTools.designspaceLib.split import splitInterpolable, splitVariableFonts
-from fontTools.ufoLib import fontInfoAttributesVersion1, fontInfoAttributesVersion2, fontInfoAttributesVersion3
+from fontTools.ufoLib import UFOReader, fontInfoAttributesVersion1, fontInfoAttributesVersion2, fontInfoAttributesVersion3
 from fontTools.misc import plistlib
 
 from fontMath.mathGlyph import MathGlyph
@@ -22,16 +28,15 @@ from mutatorMath.objects.location import Location
 
 import fontParts.fontshell.font
 
-from ufoProcessor.varModels import VariationModelMutator
+from ufoProcessor.varModels import VariationModelMutator, ScalarCache
+from ufoProcessor.mutatorCache import GlifHashes, fileHash
+from ufoProcessor.componentGraph import ComponentGraph
+from ufoProcessor.observer import SourceObserver
 from ufoProcessor.emptyPen import checkGlyphIsEmpty, DecomposePointPen
 from ufoProcessor.logger import Logger
 from ufoProcessor.rules import swapGlyphNames
 
 
-_memoizeCache = dict()
-_memoizeStats = dict()
-
-
 def ip(a, b, f):
     return a+f*(b-a)
 
@@ -95,29 +100,350 @@ class MemoizeDict(dict):
         return self._hash
 
 
+def estimateSize(obj, _seen=None, _depth=0):
+    # return a rough estimate of the memory used by obj, in bytes.
+    # good enough to keep a budget for the memoize cache, not an exact count.
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen or _depth > 8:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimateSize(key, _seen, _depth + 1)
+            size += estimateSize(value, _seen, _depth + 1)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for value in obj:
+            size += estimateSize(value, _seen, _depth + 1)
+    elif hasattr(obj, "__dict__"):
+        attributes = vars(obj)
+        # objects can name the attributes they share with other objects
+        sharedAttributes = getattr(obj, "sharedAttributes", ())
+        if sharedAttributes:
+            attributes = {name: value for name, value in attributes.items() if name not in sharedAttributes}
+        size += estimateSize(attributes, _seen, _depth + 1)
+    return size
+
+
+_notFound = object()
+
+
+class MemoizeCache(object):
+
+    """
+    A bounded store for the memoize decorator.
+    Entries are evicted in least recently used order.
+
+    maxEntries: maximum number of results in the cache, None for no limit.
+    maxBytes: approximate memory budget for the results, None for no limit.
+    quotas: dict with function name: maximum number of entries for that function.
+        A function that exceeds its quota evicts its own oldest entries,
+        so a flood of makeOneGlyph results can not push out the glyph mutators.
+
+    Entries can be stored with an owner and a glyph name. The cache keeps an index
+    of the keys for each owner and each (owner, glyphName), so clearing the results
+    of one operator, or of one glyph, does not have to look at the whole cache.
+    """
+
+    def __init__(self, maxEntries=None, maxBytes=None, quotas=None):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.quotas = {}
+        if quotas is not None:
+            self.quotas.update(quotas)
+        self.stats = {}
+        self.byteCount = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._sizes = {}
+        self._functionKeys = {}
+        self._keyTags = {}
+        self._ownerKeys = {}
+        self._glyphKeys = {}
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(list(self._entries.keys()))
+
+    def __getitem__(self, key):
+        value = self._entries[key]
+        self._entries.move_to_end(key)
+        self._functionKeys[key[0]].move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.store(key, value)
+
+    def store(self, key, value, owner=None, glyphName=None):
+        """Store value under key. Keep track of the owner and glyphName, if given."""
+        if key in self._entries:
+            self._remove(key)
+        funcName = key[0]
+        size = estimateSize(value)
+        self._entries[key] = value
+        self._sizes[key] = size
+        self.stats[key] = 1
+        self.byteCount += size
+        if funcName not in self._functionKeys:
+            self._functionKeys[funcName] = collections.OrderedDict()
+        self._functionKeys[funcName][key] = None
+        if owner is not None:
+            self._keyTags[key] = owner, glyphName
+            if owner not in self._ownerKeys:
+                self._ownerKeys[owner] = set()
+            self._ownerKeys[owner].add(key)
+            if glyphName is not None:
+                if owner not in self._glyphKeys:
+                    self._glyphKeys[owner] = {}
+                if glyphName not in self._glyphKeys[owner]:
+                    self._glyphKeys[owner][glyphName] = set()
+                self._glyphKeys[owner][glyphName].add(key)
+        self._evict(funcName)
+
+    def __delitem__(self, key):
+        if key not in self._entries:
+            raise KeyError(key)
+        self._remove(key)
+
+    def get(self, key, default=None):
+        if key in self._entries:
+            return self[key]
+        return default
+
+    def lookup(self, key, default=None):
+        """Return the value for key and count the hit. Return default if there is no entry."""
+        value = self._entries.get(key, _notFound)
+        if value is _notFound:
+            return default
+        self._entries.move_to_end(key)
+        self._functionKeys[key[0]].move_to_end(key)
+        self.stats[key] += 1
+        return value
+
+    def tagsForKey(self, key):
+        """Return the (owner, glyphName) this key was stored with."""
+        return self._keyTags.get(key, (None, None))
+
+    def keys(self):
+        return list(self._entries.keys())
+
+    def values(self):
+        return list(self._entries.values())
+
+    def items(self):
+        return list(self._entries.items())
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self._functionKeys.clear()
+        self._keyTags.clear()
+        self._ownerKeys.clear()
+        self._glyphKeys.clear()
+        self.stats.clear()
+        self.byteCount = 0
+
+    def setLimits(self, maxEntries=None, maxBytes=None, quotas=None):
+        """Change the limits of this cache, evict what no longer fits."""
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.quotas = {}
+        if quotas is not None:
+            self.quotas.update(quotas)
+        for funcName in list(self._functionKeys.keys()):
+            self._evict(funcName)
+
+    def countForFunction(self, funcName):
+        return len(self._functionKeys.get(funcName, ()))
+
+    def removeOwner(self, owner):
+        """Remove all entries stored for this owner."""
+        for key in list(self._ownerKeys.get(owner, ())):
+            self._remove(key)
+
+    def removeGlyphs(self, owner, glyphNames, funcNames=None):
+        """Remove the entries stored for these glyphNames of this owner.
+        If funcNames is given, only remove the entries for those functions.
+        """
+        ownerGlyphKeys = self._glyphKeys.get(owner)
+        if not ownerGlyphKeys:
+            return
+        for glyphName in glyphNames:
+            for key in list(ownerGlyphKeys.get(glyphName, ())):
+                if funcNames is not None and key[0] not in funcNames:
+                    continue
+                self._remove(key)
+
+    def removeFunctions(self, owner, funcNames):
+        """Remove the entries stored for these functions of this owner."""
+        for key in list(self._ownerKeys.get(owner, ())):
+            if key[0] in funcNames:
+                self._remove(key)
+
+    def glyphNamesForOwner(self, owner):
+        """Return the glyph names that have entries for this owner."""
+        return list(self._glyphKeys.get(owner, {}).keys())
+
+    def _remove(self, key):
+        del self._entries[key]
+        self.byteCount -= self._sizes.pop(key)
+        functionKeys = self._functionKeys[key[0]]
+        del functionKeys[key]
+        if not functionKeys:
+            del self._functionKeys[key[0]]
+        if key in self.stats:
+            del self.stats[key]
+        if key in self._keyTags:
+            owner, glyphName = self._keyTags.pop(key)
+            ownerKeys = self._ownerKeys[owner]
+            ownerKeys.discard(key)
+            if not ownerKeys:
+                del self._ownerKeys[owner]
+            if glyphName is not None:
+                ownerGlyphKeys = self._glyphKeys[owner]
+                glyphKeys = ownerGlyphKeys[glyphName]
+                glyphKeys.discard(key)
+                if not glyphKeys:
+                    del ownerGlyphKeys[glyphName]
+                if not ownerGlyphKeys:
+                    del self._glyphKeys[owner]
+
+    def _evict(self, funcName):
+        # first the quota for this function
+        quota = self.quotas.get(funcName)
+        if quota is not None:
+            functionKeys = self._functionKeys.get(funcName)
+            while functionKeys and len(functionKeys) > quota:
+                self._remove(next(iter(functionKeys)))
+                self.evictions += 1
+        # then the overall limits
+        while self._entries and self._overLimits():
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _overLimits(self):
+        if self.maxEntries is not None and len(self._entries) > self.maxEntries:
+            return True
+        if self.maxBytes is not None and self.byteCount > self.maxBytes:
+            return True
+        return False
+
+
+# the default limits keep a long running session at a flat memory use.
+# makeOneGlyph results are cheap to remake, so they get a quota.
+_memoizeCache = MemoizeCache(
+    maxEntries=50000,
+    maxBytes=1024 * 1024 * 1024,
+    quotas=dict(makeOneGlyph=10000),
+)
+_memoizeStats = _memoizeCache.stats
+
+
+def setMemoizeCacheLimits(maxEntries=None, maxBytes=None, quotas=None):
+    """Set the limits of the memoize cache shared by all UFOOperators.
+    maxEntries: maximum number of cached results, None for no limit.
+    maxBytes: approximate memory budget in bytes, None for no limit.
+    quotas: dict with function name: maximum number of entries for that function.
+    """
+    _memoizeCache.setLimits(maxEntries=maxEntries, maxBytes=maxBytes, quotas=quotas)
+
+
+def _removeOwnerFromCache(ownerReference):
+    # called when the owner of cache entries is garbage collected.
+    if _memoizeCache is None:
+        # the module is already being cleared out
+        return
+    _memoizeCache.removeOwner(ownerReference)
+
+
+def memoizeOwnerReference(obj):
+    # return the weak reference that stands in for obj in the memoize cache keys.
+    # The cache does not keep obj alive, and when obj is collected
+    # all of its entries are removed from the cache.
+    ownerReference = obj.__dict__.get("_memoizeOwnerReference")
+    if ownerReference is None:
+        ownerReference = weakref.ref(obj, _removeOwnerFromCache)
+        obj.__dict__["_memoizeOwnerReference"] = ownerReference
+    return ownerReference
+
+
+_plainKeyTypes = {str, int, float, bool, type(None)}
+
+
+def makeKeyValue(value):
+    # return a cheap hashable version of value for a memoize key.
+    # locations and other dicts become sorted tuples of their items.
+    if type(value) in _plainKeyTypes:
+        return value
+    if isinstance(value, dict):
+        return dict, tuple(sorted([(key, item if type(item) in _plainKeyTypes else makeKeyValue(item)) for key, item in value.items()]))
+    if isinstance(value, (list, tuple)):
+        return tuple([item if type(item) in _plainKeyTypes else makeKeyValue(item) for item in value])
+    if isinstance(value, (set, frozenset)):
+        return frozenset, tuple(sorted(makeKeyValue(item) for item in value))
+    return value
+
+
 def memoize(function):
-    signature = inspect.signature(function)
-    argsKeys = [parameter.name for parameter in signature.parameters.values()]
+    # The key for each call is a tuple: (function name, owner, argument values)
+    # The parameters are inspected once, when the method is decorated.
+    # The owner is the weak reference to self, which caches its own hash.
+    funcName = function.__name__
+    parameters = list(inspect.signature(function).parameters.values())
+    hasOwner = bool(parameters) and parameters[0].name == "self"
+    if hasOwner:
+        parameters = parameters[1:]
+    namedParameters = [parameter for parameter in parameters if parameter.kind in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY)]
+    names = [parameter.name for parameter in namedParameters]
+    defaults = [parameter.default for parameter in namedParameters]
+    namedCount = len(names)
+    hasVarKeywords = any(parameter.kind == parameter.VAR_KEYWORD for parameter in parameters)
+    glyphNameIndex = names.index("glyphName") if "glyphName" in names else None
+
+    def makeKey(args, kwargs):
+        if hasOwner:
+            owner = memoizeOwnerReference(args[0])
+            args = args[1:]
+        else:
+            owner = None
+        if not kwargs and len(args) == namedCount:
+            values = args
+        else:
+            # fill in the keyword arguments and the defaults, in signature order
+            values = list(args)
+            for index in range(len(args), namedCount):
+                values.append(kwargs.get(names[index], defaults[index]))
+        keyValues = [value if type(value) in _plainKeyTypes else makeKeyValue(value) for value in values]
+        if hasVarKeywords:
+            # **kwargs, in a fixed order
+            keyValues.append(tuple(sorted([(name, makeKeyValue(value)) for name, value in kwargs.items() if name not in names])))
+        key = (funcName, owner, tuple(keyValues))
+        glyphName = None
+        if glyphNameIndex is not None and glyphNameIndex < len(values):
+            glyphName = values[glyphNameIndex]
+        return key, owner, glyphName
 
     @functools.wraps(function)
     def wrapper(*args, **kwargs):
-        immutablekwargs = immutify(dict(
-            **{key: value for key, value in zip(argsKeys, args)},
-            **kwargs
-        ))
-        key = (function.__name__, immutablekwargs)
-
-        if key in _memoizeCache:
-            # keep track of how often we get to serve something from the cache
-            # note: if the object itself is part of the key
-            # keeping these stats will keep the object around
-            _memoizeStats[key] += 1
-            return _memoizeCache[key]
-        else:
-            result = function(*args, **kwargs)
-            _memoizeCache[key] = result
-            _memoizeStats[key] = 1
+        key, owner, glyphName = makeKey(args, kwargs)
+        # keep track of how often we get to serve something from the cache
+        result = _memoizeCache.lookup(key, _notFound)
+        if result is not _notFound:
             return result
+        result = function(*args, **kwargs)
+        # storing the result also starts the stats for this key
+        # index the key by object and glyphname for quick invalidation
+        _memoizeCache.store(key, result, owner=owner, glyphName=glyphName)
+        return result
+    wrapper.makeKey = makeKey
     return wrapper
 
 
@@ -125,25 +451,54 @@ def inspectMemoizeCache():
     frequency = []
     objects = {}
     items = []
-    for (funcName, data), value in _memoizeCache.items():
-        if funcName == "getGlyphMutator":
-            functionName = f"{id(data['self']):X} {funcName}: {data['glyphName']}"
+    for key in _memoizeCache.keys():
+        funcName, owner, values = key
+        operator = owner() if owner is not None else None
+        _, glyphName = _memoizeCache.tagsForKey(key)
+        if glyphName is not None:
+            functionName = f"{id(operator):X} {funcName}: {glyphName}"
         else:
-            functionName = f"{id(data['self']):X} {funcName}"
+            functionName = f"{id(operator):X} {funcName}"
         if functionName not in objects:
             objects[functionName] = 0
         objects[functionName] += 1
+        frequency.append((functionName, _memoizeStats.get(key, 0)))
     items = [(k, v) for k, v in objects.items()]
-    for key in _memoizeStats.keys():
-        if funcName == "getGlyphMutator":
-            functionName = f"{id(data['self']):X} {funcName}: {data['glyphName']}"
-        else:
-            functionName = f"{id(data['self']):X} {funcName}"
-        called = _memoizeStats[key]
-        frequency.append((functionName, called))
     frequency.sort()
     return items, frequency
 
+def _generateUFOsInProcess(state, instanceIndices, doRules=False, incremental=False):
+    # generate the UFOs for these instances in a separate process.
+    # return a dict with instance index: (path, glyph count)
+    operator = UFOOperator._fromProcessState(state)
+    instanceDescriptors = [instanceDescriptor for instanceDescriptor in operator.doc.instances if instanceDescriptor.path is not None]
+    glifHashes = GlifHashes()
+    results = {}
+    for index in instanceIndices:
+        results[index] = operator._generateUFO(instanceDescriptors[index], doRules=doRules, incremental=incremental, glifHashes=glifHashes)
+    return results
+
+
+# the operator for the glyph processes of makeInstance
+_processOperator = None
+
+
+def _initProcessOperator(state):
+    global _processOperator
+    _processOperator = UFOOperator._fromProcessState(state)
+
+
+def _makeGlyphInstanceObjectsInProcess(glyphNames, arguments):
+    # make the math glyphs for these glyph names with the operator of this process.
+    continuousLocation, discreteLocation, locHorizontal, locVertical, decomposeComponents, bend = arguments
+    results = {}
+    for glyphName in glyphNames:
+        result = _processOperator._makeGlyphInstanceObject(glyphName, continuousLocation, discreteLocation, locHorizontal, locVertical, decomposeComponents=decomposeComponents, bend=bend)
+        if result is not None:
+            results[glyphName] = result
+    return results
+
+
 def getDefaultLayerName(f):
     # get the name of the default layer from a defcon font (outside RF) and from a fontparts font (outside and inside RF)
     if isinstance(f, defcon.objects.font.Font):
@@ -152,6 +507,77 @@ def getDefaultLayerName(f):
         return f.defaultLayer.name
     return None
 
+def indexSourceGlyphNames(path, layerName=None):
+    # read the glyph names of the default layer and of layerName from the contents.plist files.
+    # return the default layer name, default layer glyph names and the glyph names of the layer.
+    with UFOReader(path, validate=False) as reader:
+        defaultLayerName = reader.getDefaultLayerName()
+        defaultGlyphNames = set(reader.getGlyphSet(defaultLayerName, validateRead=False).keys())
+        if layerName is None or layerName == defaultLayerName:
+            return defaultLayerName, defaultGlyphNames, defaultGlyphNames
+        if layerName not in reader.getLayerNames():
+            return defaultLayerName, defaultGlyphNames, set()
+        return defaultLayerName, defaultGlyphNames, set(reader.getGlyphSet(layerName, validateRead=False).keys())
+
+
+class LazyFontDict(dict):
+
+    """
+    The source fonts of a UFOOperator, by source name.
+
+    A source can be added as pending: only the glyph names from contents.plist are indexed,
+    the font object is made when the source is asked for by name.
+    Iterating, values() and items() only show the fonts that have been loaded.
+    """
+
+    def __init__(self, loadFont=None, fontSet=None):
+        super(LazyFontDict, self).__init__()
+        # loadFont: callable(name, path) that returns the font object.
+        # fontSet: callable(name, font), called when a font is loaded or replaced.
+        # Weak methods, so the dict does not keep the operator alive.
+        self._loadFont = None
+        if loadFont is not None:
+            self._loadFont = weakref.WeakMethod(loadFont)
+        self._fontSet = None
+        if fontSet is not None:
+            self._fontSet = weakref.WeakMethod(fontSet)
+        self.pending = {}
+
+    def addPending(self, name, path, layerName=None):
+        defaultLayerName, defaultGlyphNames, layerGlyphNames = indexSourceGlyphNames(path, layerName)
+        self.pending[name] = dict(
+            path=path,
+            defaultLayerName=defaultLayerName,
+            defaultGlyphNames=defaultGlyphNames,
+            layerGlyphNames=layerGlyphNames,
+        )
+
+    def isPending(self, name):
+        return name in self.pending
+
+    def __missing__(self, name):
+        if name not in self.pending:
+            raise KeyError(name)
+        path = self.pending[name]["path"]
+        font = self._loadFont()(name, path)
+        self[name] = font
+        return font
+
+    def __setitem__(self, name, font):
+        self.pending.pop(name, None)
+        super(LazyFontDict, self).__setitem__(name, font)
+        if self._fontSet is not None:
+            self._fontSet()(name, font)
+
+    def __contains__(self, name):
+        return super(LazyFontDict, self).__contains__(name) or name in self.pending
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+
+
 def getLayer(f, layerName):
     # get the layer from a defcon font and from a fontparts font
     if isinstance(f, defcon.objects.font.Font):
@@ -163,6 +589,44 @@ def getLayer(f, layerName):
     return None
 
 
+class AxisTable(object):
+    """ The axis values the UFOOperator looks up for every glyph,
+        read once from the axis descriptors.
+        The mapped values are in designspace coordinates.
+    """
+
+    def __init__(self, axes):
+        self.axes = list(axes)
+        self.axisOrder = [axisDescriptor.name for axisDescriptor in self.axes]
+        self.indexByName = {}
+        self.axesByName = {}
+        self.discreteAxes = []
+        self.continuousAxes = []
+        self.discreteAxisNames = set()
+        self.discreteValues = {}    # axis name: set of values
+        self.defaults = {}          # axis name: default, not mapped
+        self.mappedDefaults = {}    # axis name: default
+        self.mappedMinimums = {}    # axis name: minimum, continuous axes only
+        self.mappedMaximums = {}    # axis name: maximum, continuous axes only
+        for index, axisDescriptor in enumerate(self.axes):
+            axisName = axisDescriptor.name
+            if axisName in self.axesByName:
+                # like DesignSpaceDocument.getAxis, the first axis with the name
+                continue
+            self.indexByName[axisName] = index
+            self.axesByName[axisName] = axisDescriptor
+            self.defaults[axisName] = axisDescriptor.default
+            self.mappedDefaults[axisName] = axisDescriptor.map_forward(axisDescriptor.default)
+            if hasattr(axisDescriptor, "values"):
+                self.discreteAxes.append(axisDescriptor)
+                self.discreteAxisNames.add(axisName)
+                self.discreteValues[axisName] = set(axisDescriptor.values)
+            else:
+                self.continuousAxes.append(axisDescriptor)
+                self.mappedMinimums[axisName] = axisDescriptor.map_forward(axisDescriptor.minimum)
+                self.mappedMaximums[axisName] = axisDescriptor.map_forward(axisDescriptor.maximum)
+
+
 class UFOOperator(object):
     # wrapped, not inherited, as Just says.
 
@@ -183,6 +647,18 @@ class UFOOperator(object):
     mathGlyphClass = MathGlyph
     mathKerningClass = MathKerning
 
+    # the varlib flavored mutator, NumpyVariationModelMutator interpolates glyphs with numpy
+    variationModelMutatorClass = VariationModelMutator
+
+    # the classes that can be set on an operator, and are sent to other processes
+    processClassAttributes = (
+        "fontClass", "layerClass", "glyphClass", "libClass",
+        "glyphContourClass", "glyphPointClass", "glyphComponentClass", "glyphAnchorClass",
+        "kerningClass", "groupsClass", "infoClass", "featuresClass",
+        "mathInfoClass", "mathGlyphClass", "mathKerningClass",
+        "variationModelMutatorClass",
+    )
+
     # RF italic slant offset lib key
     italicSlantOffsetLibKey = "com.typemytype.robofont.italicSlantOffset"
 
@@ -212,11 +688,29 @@ class UFOOperator(object):
 
     # In summary, these are separate mechanisms to mute glyphs, mute location, exclude glyphs and skip glyphs.
 
+    # Name of the file in the data folder of generated UFOs with the digests for incremental generateUFOs.
+    incrementalManifestFileName = 'com.letterror.ufoProcessor.incremental.json'
+    # Files in the source UFOs that the kerning, info, groups, features and lib depend on.
+    incrementalFontFileNames = ["fontinfo.plist", "kerning.plist", "groups.plist", "lib.plist", "features.fea"]
+
     def __init__(self, pathOrObject=None, ufoVersion=3, useVarlib=True, extrapolate=False, strict=False, debug=False):
         self.ufoVersion = ufoVersion
         self.useVarlib = useVarlib
         self._fontsLoaded = False
-        self.fonts = {}
+        self.fonts = LazyFontDict(loadFont=self._loadPendingFont, fontSet=self._sourceFontSet)
+        self.fontLoadTimes = {}
+        self.scalarCache = ScalarCache()
+        self.modelPool = {}     # varlib models for each set of master locations
+        self.mutatorCache = None    # a MutatorCache to keep glyph mutators between runs
+        self._componentGraphs = {}     # source name: (font, ComponentGraph)
+        self._sourceIndexes = {}    # discrete axis names: {discrete values: [sourceDescriptors]}
+        self._sourceIndexState = None
+        self._axisTable = None      # (id and length of doc.axes, AxisTable)
+        self._sourceAvailability = {}   # ufo path: True if the ufo exists
+        self._sourceMathGlyphs = {}     # (source name, layer name, glyph name, decomposed, strict): (font, change token, MathGlyph)
+        self._glyphChangeCounts = {}    # glyph name: number of glyphChanged calls for all sources
+        self._sourceGlyphChangeCounts = {}  # (source name, glyph name): number of glyphChanged calls for this source
+        self.sourceObserver = None  # a SourceObserver when the notifications of the source fonts are observed
         self.tempLib = {}
         self.libKeysForProcessing = [self.italicSlantOffsetLibKey]
         self.roundGeometry = False
@@ -236,11 +730,13 @@ class UFOOperator(object):
         if self.debug:
             self.startLog()
 
-    def startLog(self):
+    def startLog(self, logPath=None):
         # so we can call it later
+        # logPath: None writes the log next to the designspace
         self.debug = True
-        docBaseName = os.path.splitext(self.doc.path)[0]
-        logPath = f"{docBaseName}_log.txt"
+        if logPath is None:
+            docBaseName = os.path.splitext(self.doc.path)[0]
+            logPath = f"{docBaseName}_log.txt"
         self.logger = Logger(path=logPath, rootDirectory=None)
         self.logger.time()
         self.logger.info(f"## {self.doc.path}")
@@ -289,10 +785,23 @@ class UFOOperator(object):
 
     def addAxis(self, axisDescriptor):
         self.doc.addAxis(axisDescriptor)
+        self._axisTable = None
 
     def addAxisDescriptor(self, **kwargs):
+        self._axisTable = None
         return self.doc.addAxisDescriptor(**kwargs)
 
+    def getAxisTable(self):
+        """Return the AxisTable for the axes of the document.
+            It is made again when doc.axes is replaced or has a different length.
+            Call changed() after editing an axis descriptor.
+        """
+        axes = self.doc.axes
+        state = (id(axes), len(axes))
+        if self._axisTable is None or self._axisTable[0] != state:
+            self._axisTable = (state, AxisTable(axes))
+        return self._axisTable[1]
+
     def addLocationLabel(self, locationLabelDescriptor):
         self.doc.addLocationLabel(locationLabelDescriptor)
 
@@ -317,6 +826,7 @@ class UFOOperator(object):
                     sourceDescriptor.name = sourceDescriptorName
             self.fonts[sourceDescriptor.name] = sourceDescriptor.font
         self.doc.addSource(sourceDescriptor)
+        self._addToSourceIndexes(sourceDescriptor)
 
     def addSourceDescriptor(self, **kwargs):
         if "font" in kwargs:
@@ -330,7 +840,9 @@ class UFOOperator(object):
                     warn(f"addSourceDescriptor warning: sourceDescriptor.name has a duplicate name '{name}''. Changing to '{sourceDescriptorName}'.")
                     kwargs["name"] = sourceDescriptorName
             self.fonts[kwargs["name"]] = kwargs["font"]
-        return self.doc.addSourceDescriptor(**kwargs)
+        sourceDescriptor = self.doc.addSourceDescriptor(**kwargs)
+        self._addToSourceIndexes(sourceDescriptor)
+        return sourceDescriptor
 
     def addInstance(self, instanceDescriptor):
         self.doc.addInstance(instanceDescriptor)
@@ -450,42 +962,139 @@ class UFOOperator(object):
         return self.doc.getAxis(axisName)
 
     # loading and updating fonts
-    def loadFonts(self, reload=False):
+    def loadFonts(self, reload=False, workers=None, lazy=False):
+        """Load the source fonts.
+            workers: number of threads that load sources at the same time.
+                None or 1 loads the sources one after the other.
+            lazy: only index the glyph names of the sources.
+                A source font is loaded when it is needed, for instance
+                when collectSourcesForGlyph finds the glyph in the source,
+                or when the info and kerning mutators are made.
+            The time it took to load each source is stored in self.fontLoadTimes.
+        """
         # Load the fonts and find the default candidate based on the info flag
         if self.logger is None and self.debug:
             # in some cases the UFOProcessor is initialised without debug
             # and then it is switched on afterwards. So have to check if
             # we have a logger before proceding.
             self.startLog()
-        # check excluded glyphs and muted glyphs when making this list
-        self.glyphNames = list({glyphname for font in self.fonts.values() for glyphname in font.keys() if font is not None})
         if self._fontsLoaded and not reload:
+            self.glyphNames = self._collectGlyphNames()
             if self.debug:
                 self.logger.info("\t\t-- loadFonts called, but fonts are loaded already and no reload requested")
             return
         actions = []
         if self.debug:
             self.logger.info("## loadFonts")
+        sourcesToLoad = []
         for i, sourceDescriptor in enumerate(self.doc.sources):
             if sourceDescriptor.name is None:
                 # make sure it has a unique name
                 sourceDescriptor.name = self.sourceNameGenerator()
             if sourceDescriptor.name not in self.fonts:
-                if os.path.exists(sourceDescriptor.path):
-                    font = self.fonts[sourceDescriptor.name] = self._instantiateFont(sourceDescriptor.path)
-                    thisLayerName = getDefaultLayerName(font)
-                    if self.debug:
-                        actions.append(f"loaded: {os.path.basename(sourceDescriptor.path)}, layer: {thisLayerName}, format: {font.ufoFormatVersionTuple}, id: {id(font):X}")
-                else:
-                    self.fonts[sourceDescriptor.name] = None
-                    if self.debug:
-                        actions.append("source ufo not found at %s" % (sourceDescriptor.path))
+                sourcesToLoad.append(sourceDescriptor)
+        # check which ufos exist once, the mutators use the recorded state
+        self.refreshSourceAvailability()
+        foundSources = [sourceDescriptor for sourceDescriptor in sourcesToLoad if self.sourceIsAvailable(sourceDescriptor)]
+        if lazy:
+            loadFunction = self._indexSourceTimed
+        else:
+            loadFunction = self._instantiateFontTimed
+        if workers is not None and workers > 1 and len(foundSources) > 1:
+            # reading the ufo files is mostly waiting for the filesystem and parsing plists
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(loadFunction, foundSources))
+        else:
+            results = [loadFunction(sourceDescriptor) for sourceDescriptor in foundSources]
+        loaded = {sourceDescriptor.name: result for sourceDescriptor, result in zip(foundSources, results)}
+        # add the fonts in the order of the sources
+        for sourceDescriptor in sourcesToLoad:
+            if lazy and sourceDescriptor.name in loaded:
+                if self.debug:
+                    actions.append(f"indexed: {os.path.basename(sourceDescriptor.path)}, layer: {sourceDescriptor.layerName}, {loaded[sourceDescriptor.name]:.3f}s")
+            elif sourceDescriptor.name in loaded:
+                font, duration = loaded[sourceDescriptor.name]
+                self.fonts[sourceDescriptor.name] = font
+                self.fontLoadTimes[sourceDescriptor.name] = duration
+                thisLayerName = getDefaultLayerName(font)
+                if self.debug:
+                    actions.append(f"loaded: {os.path.basename(sourceDescriptor.path)}, layer: {thisLayerName}, format: {font.ufoFormatVersionTuple}, id: {id(font):X}, {duration:.3f}s")
+            else:
+                self.fonts[sourceDescriptor.name] = None
+                if self.debug:
+                    actions.append("source ufo not found at %s" % (sourceDescriptor.path))
         if self.debug:
             for item in actions:
                 self.logger.infoItem(item)
         self._fontsLoaded = True
+        self.glyphNames = self._collectGlyphNames()
         # XX maybe also make a character map here?
 
+    def refreshSourceAvailability(self, paths=None):
+        """Check again if the source ufos exist.
+            paths: only check these ufo paths. None checks all sources.
+        """
+        if paths is None:
+            self._sourceAvailability.clear()
+            paths = [sourceDescriptor.path for sourceDescriptor in self.doc.sources]
+        for path in paths:
+            if path is not None:
+                self._sourceAvailability[path] = os.path.exists(path)
+
+    def sourceIsAvailable(self, sourceDescriptor):
+        # return True if the ufo of this source exists, or if the source has a font object.
+        # The filesystem is checked once for each path, see refreshSourceAvailability()
+        path = sourceDescriptor.path
+        if path is None:
+            return sourceDescriptor.font is not None
+        available = self._sourceAvailability.get(path)
+        if available is None:
+            available = self._sourceAvailability[path] = os.path.exists(path)
+        return available
+
+    def _instantiateFontTimed(self, sourceDescriptor):
+        # return the font object and the time it took to load it
+        start = time.time()
+        font = self._instantiateFont(sourceDescriptor.path)
+        return font, time.time() - start
+
+    def _indexSourceTimed(self, sourceDescriptor):
+        # add the source as pending font, return the time it took to index it
+        start = time.time()
+        self.fonts.addPending(sourceDescriptor.name, sourceDescriptor.path, sourceDescriptor.layerName)
+        return time.time() - start
+
+    def _loadPendingFont(self, name, path):
+        # called by self.fonts when a pending source is needed
+        start = time.time()
+        font = self._instantiateFont(path)
+        duration = self.fontLoadTimes[name] = time.time() - start
+        if self.debug:
+            self.logger.infoItem(f"loaded pending source: {os.path.basename(path)}, id: {id(font):X}, {duration:.3f}s")
+        return font
+
+    def _sourceFontSet(self, name, font):
+        # called by self.fonts when a source font is loaded or replaced
+        if self.sourceObserver is not None:
+            self.sourceObserver.observeFont(name, font)
+
+    def _collectGlyphNames(self):
+        # check excluded glyphs and muted glyphs when making this list
+        names = {glyphname for font in self.fonts.values() if font is not None for glyphname in font.keys()}
+        for pendingSource in self.fonts.pending.values():
+            names.update(pendingSource["defaultGlyphNames"])
+        return list(names)
+
+    def sourceHasGlyph(self, sourceDescriptor, glyphName):
+        # return False if we know the source does not have the glyph.
+        # For pending sources the index is used, the font is not loaded.
+        pendingSource = self.fonts.pending.get(sourceDescriptor.name)
+        if pendingSource is None:
+            return True
+        if glyphName not in pendingSource["defaultGlyphNames"]:
+            return False
+        return glyphName in pendingSource["layerGlyphNames"]
+
     def _logLoadedFonts(self):
         # dump info about the loaded fonts to the log
         self.logger.info("\t# font status:")
@@ -500,6 +1109,14 @@ class UFOOperator(object):
         for newFont in fontObjects:
             # XX can we update font objects which arent stored on disk?
             if newFont.path is not None:
+                for fontName, pendingSource in list(self.fonts.pending.items()):
+                    # a source that is not loaded yet
+                    if pendingSource["path"] == newFont.path:
+                        if self.debug:
+                            self.logger.time()
+                            self.logger.info(f"## updating pending source {fontName} with {newFont}")
+                        self.fonts[fontName] = newFont
+                        hasUpdated = True
                 for fontName, haveFont in self.fonts.items():
                     # XX what happens here when the font did not load?
                     # haveFont will be None. Scenario: font initially missing, then added.
@@ -536,6 +1153,9 @@ class UFOOperator(object):
             if otherFontObj.path == fontObj.path:
                 # we don't need to know anything else
                 return True
+        for pendingSource in self.fonts.pending.values():
+            if pendingSource["path"] == fontObj.path:
+                return True
         return False
 
     def getCharacterMapping(self, discreteLocation=None):
@@ -554,74 +1174,99 @@ class UFOOperator(object):
         return characterMap
 
     # caching
-    def __del__(self):
-        self.changed()
-
+    # The memoize cache refers to this object with a weak reference.
+    # When the object is garbage collected its cache entries are removed.
     def changed(self):
         # clears everything relating to this designspacedocument
         # the cache could contain more designspacedocument objects.
-        if _memoizeCache == None:
-            # it can happen that changed is called after we're already clearing out.
-            # Otherwise it _memoizeCache will be a dict.
-            # If it is no longer a dict, it will not have anything left in store.
-            return
-        for key in list(_memoizeCache.keys()):
-            funcName, data = key
-            if data["self"] == self:
-                del _memoizeCache[key]
-                if key in _memoizeStats:
-                    del _memoizeStats[key]
+        _memoizeCache.removeOwner(memoizeOwnerReference(self))
+        self.scalarCache.clear()
+        self.modelPool.clear()
+        self._componentGraphs.clear()
+        self._sourceIndexes.clear()
+        self._axisTable = None
+        self._sourceAvailability.clear()
+        self._sourceMathGlyphs.clear()
 
     _cachedCallbacksWithGlyphNames = ("getGlyphMutator", "collectSourcesForGlyph", "makeOneGlyph")
 
-    def glyphChanged(self, glyphName, includeDependencies=False):
+    def glyphChanged(self, glyphName, includeDependencies=False, sourceNames=None):
         """Clears this one specific glyph from the memoize cache
         includeDependencies = True: check where glyphName is used as a component
             and remove those as well.
             Note: this must be check in each discreteLocation separately
-            because they can have different constructions."""
+            because they can have different constructions.
+        sourceNames: the names of the sources in which the glyph changed.
+            The MathGlyphs of the glyph in the other sources are kept.
+            None: the glyph changed in all sources."""
+        if sourceNames is None:
+            self._glyphChangeCounts[glyphName] = self._glyphChangeCounts.get(glyphName, 0) + 1
+        else:
+            for sourceName in sourceNames:
+                key = (sourceName, glyphName)
+                self._sourceGlyphChangeCounts[key] = self._sourceGlyphChangeCounts.get(key, 0) + 1
         changedNames = set()
         changedNames.add(glyphName)
+        self._updateComponentGraphs(glyphName)
 
         if includeDependencies:
             dependencies = self.getGlyphDependencies(glyphName)
             if dependencies:
                 changedNames.update(dependencies)
 
-        remove = []
-
-        for key in list(_memoizeCache.keys()):
-            funcName, data = key
-            if data["self"] == self and funcName in self._cachedCallbacksWithGlyphNames and data["glyphName"] in changedNames:
-                remove.append(key)
-
-        remove = set(remove)
-        for key in remove:
-            del _memoizeCache[key]
-            if key in _memoizeStats:
-                del _memoizeStats[key]
+        _memoizeCache.removeGlyphs(memoizeOwnerReference(self), changedNames, funcNames=self._cachedCallbacksWithGlyphNames)
+        if self.mutatorCache is not None:
+            self.mutatorCache.glifHashes.removeGlyphs(changedNames)
+
+    # the memoized mutators that use the kerning, info, groups, lib and features of the sources
+    _cachedCallbacksForFontData = dict(
+        info=("getInfoMutator", ),
+        kerning=("getKerningMutator", ),
+        groups=("getKerningMutator", ),
+        lib=("getLibEntryMutator", ),
+        features=(),
+    )
+
+    def fontDataChanged(self, *dataNames):
+        """Clears the mutators for the changed font data from the memoize cache
+        dataNames: any of "info", "kerning", "groups", "lib", "features"
+        """
+        funcNames = set()
+        for dataName in dataNames:
+            funcNames.update(self._cachedCallbacksForFontData.get(dataName, ()))
+        if funcNames:
+            _memoizeCache.removeFunctions(memoizeOwnerReference(self), funcNames)
 
     def getGlyphDependencies(self, glyphName):
+        # return the names of the glyphs that use glyphName as a component,
+        # also as a component of a component, in any of the discrete locations.
         dependencies = set()
-        discreteLocation = self.getDiscreteLocations()
-        if not discreteLocation:
-            discreteLocation = [None]
-        for discreteLocation in discreteLocation:
-            # this is expensive, should it be cached?
-            reverseComponentMap = self.getReverseComponentMapping(discreteLocation)
-            if glyphName not in reverseComponentMap:
-                return None
-            for compName in reverseComponentMap[glyphName]:
-                dependencies.add(compName)
+        discreteLocations = self.getDiscreteLocations()
+        if not discreteLocations:
+            discreteLocations = [None]
+        for discreteLocation in discreteLocations:
+            componentGraph = self.getComponentGraph(discreteLocation)
+            if componentGraph is not None:
+                dependencies.update(componentGraph.getDependents(glyphName))
         return dependencies
 
+    def startObservingSources(self):
+        """Observe the defcon notifications of the source fonts.
+        Edits in the fonts then only remove the affected mutators from the cache,
+        there is no need to call glyphChanged() or changed().
+        Fonts that are loaded later are observed as well."""
+        if self.sourceObserver is None:
+            self.sourceObserver = SourceObserver(self)
+            self.sourceObserver.start()
+
+    def stopObservingSources(self):
+        if self.sourceObserver is not None:
+            self.sourceObserver.stop()
+            self.sourceObserver = None
+
     def glyphsInCache(self):
         """report which glyphs are in the cache at the moment"""
-        names = set()
-        for funcName, data in list(_memoizeCache.keys()):
-            if funcName in self._cachedCallbacksWithGlyphNames and data["self"] == self:
-                names.add(data["glyphName"])
-        names = list(names)
+        names = _memoizeCache.glyphNamesForOwner(memoizeOwnerReference(self))
         names.sort()
         return names
 
@@ -659,7 +1304,7 @@ class UFOOperator(object):
     def splitLocation(self, location):
         # split a location in a continouous and a discrete part
         # Note: discrete can be None
-        discreteAxes = [a.name for a in self.getOrderedDiscreteAxes()]
+        discreteAxes = self.getAxisTable().discreteAxisNames
         continuous = {}
         discrete = {}
         for name, value in location.items():
@@ -730,27 +1375,18 @@ class UFOOperator(object):
 
     def getOrderedDiscreteAxes(self):
         # return the list of discrete axis objects, in the right order
-        axes = []
-        for axisName in self.doc.getAxisOrder():
-            axisObj = self.doc.getAxis(axisName)
-            if hasattr(axisObj, "values"):
-                axes.append(axisObj)
-        return axes
+        return list(self.getAxisTable().discreteAxes)
 
     def getOrderedContinuousAxes(self):
         # return the list of continuous axis objects, in the right order
-        axes = []
-        for axisName in self.doc.getAxisOrder():
-            axisObj = self.doc.getAxis(axisName)
-            if not hasattr(axisObj, "values"):
-                axes.append(axisObj)
-        return axes
+        return list(self.getAxisTable().continuousAxes)
 
     def checkDiscreteAxisValues(self, location):
         # check if the discrete values in this location are allowed
-        for discreteAxis in self.getOrderedDiscreteAxes():
+        axisTable = self.getAxisTable()
+        for discreteAxis in axisTable.discreteAxes:
             testValue = location.get(discreteAxis.name)
-            if testValue not in discreteAxis.values:
+            if testValue not in axisTable.discreteValues[discreteAxis.name]:
                 return False
         return True
 
@@ -759,21 +1395,40 @@ class UFOOperator(object):
         # Note: different discrete values mean that the glyph component set up can be different too
         continuousLocation, discreteLocation = self.splitLocation(location)
         names = set()
-        def _getComponentNames(glyph):
-            # so we can do recursion
-            names = set()
-            for comp in glyph.components:
-                names.add(comp.baseGlyph)
-                for n in _getComponentNames(glyph.font[comp.baseGlyph]):
-                    names.add(n)
-            return list(names)
         for sourceDescriptor in self.findSourceDescriptorsForDiscreteLocation(discreteLocation):
             sourceFont = self.fonts[sourceDescriptor.name]
             if glyphName not in sourceFont:
                 continue
-            [names.add(n) for n in _getComponentNames(sourceFont[glyphName])]
+            # the component graph of each source caches the base glyphs.
+            # Making the graph reads every glyph of the font, so with sources
+            # that are not loaded yet only the components of this glyph are read.
+            componentGraph = self._getCachedSourceComponentGraph(sourceDescriptor.name)
+            if componentGraph is None and not self.fonts.pending:
+                componentGraph = self.getSourceComponentGraph(sourceDescriptor.name)
+            if componentGraph is not None:
+                names.update(componentGraph.getBaseGlyphs(glyphName))
+            else:
+                names.update(self._readBaseGlyphs(sourceFont, glyphName))
         return list(names)
 
+    def _readBaseGlyphs(self, font, glyphName):
+        # return the base glyphs this glyph needs, also for components of components,
+        # reading only those glyphs from the font.
+        found = set()
+        todo = [glyphName]
+        while todo:
+            name = todo.pop()
+            if name not in font:
+                continue
+            for component in font[name].components:
+                baseGlyphName = component.baseGlyph
+                # the check also stops at cyclic references
+                if baseGlyphName not in found:
+                    found.add(baseGlyphName)
+                    todo.append(baseGlyphName)
+        found.discard(glyphName)
+        return found
+
     def sourceNameGenerator(self, prefix="source", count=1):
         name = f"{prefix}.{count}"
         for sourceDescriptor in self.sources:
@@ -785,29 +1440,56 @@ class UFOOperator(object):
         # return a list of all sourcedescriptors that share the values in the discrete loc tuple
         # so this includes all sourcedescriptors that point to layers
         # discreteLocDict {'countedItems': 1.0, 'outlined': 0.0}, {'countedItems': 1.0, 'outlined': 1.0}
-        sources = []
-        for s in self.doc.sources:
-            ok = True
-            if discreteLocDict is None:
-                sources.append(s)
-                continue
-            for name, value in discreteLocDict.items():
-                if name in s.location:
-                    if s.location[name] != value:
-                        ok = False
-                else:
-                    ok = False
-                    continue
-            if ok:
-                sources.append(s)
-        return sources
+        if discreteLocDict is None:
+            return list(self.doc.sources)
+        axisNames = tuple(sorted(discreteLocDict))
+        sourceIndex = self._getSourceIndex(axisNames)
+        return list(sourceIndex.get(tuple(discreteLocDict[name] for name in axisNames), ()))
+
+    # the sources are indexed by their values for a set of axis names,
+    # so findSourceDescriptorsForDiscreteLocation does not need to compare each source.
+    # The indexes are made again when self.doc.sources is replaced or has a different length,
+    # call changed() after editing the location of a source.
+    _missingSourceValue = object()
+
+    def _getSourceIndex(self, axisNames):
+        sources = self.doc.sources
+        state = (id(sources), len(sources))
+        if self._sourceIndexState != state:
+            self._sourceIndexes.clear()
+            self._sourceIndexState = state
+        sourceIndex = self._sourceIndexes.get(axisNames)
+        if sourceIndex is None:
+            sourceIndex = self._sourceIndexes[axisNames] = {}
+            for sourceDescriptor in sources:
+                self._addToSourceIndex(sourceIndex, axisNames, sourceDescriptor)
+        return sourceIndex
+
+    def _addToSourceIndex(self, sourceIndex, axisNames, sourceDescriptor):
+        # a source without a value for one of the axes is never found
+        key = tuple(sourceDescriptor.location.get(name, self._missingSourceValue) for name in axisNames)
+        if key not in sourceIndex:
+            sourceIndex[key] = []
+        sourceIndex[key].append(sourceDescriptor)
+
+    def _addToSourceIndexes(self, sourceDescriptor):
+        # keep the indexes in sync with a source that was just added
+        sources = self.doc.sources
+        if self._sourceIndexState != (id(sources), len(sources) - 1):
+            # the sources were changed some other way, index them again when they are needed
+            self._sourceIndexes.clear()
+            self._sourceIndexState = None
+            return
+        self._sourceIndexState = (id(sources), len(sources))
+        for axisNames, sourceIndex in self._sourceIndexes.items():
+            self._addToSourceIndex(sourceIndex, axisNames, sourceDescriptor)
 
     def getVariationModel(self, items, axes, bias=None):
         # Return either a mutatorMath or a varlib.model object for calculating.
         if self.useVarlib:
             # use the varlib variation model
             try:
-                return dict(), VariationModelMutator(items, axes=self.doc.axes, extrapolate=True)
+                return dict(), self.variationModelMutatorClass(items, axes=self.doc.axes, extrapolate=True, scalarCache=self.scalarCache, modelPool=self.modelPool)
             except TypeError:
                 if self.debug:
                     note = "Error while making VariationModelMutator for {loc}:\n{traceback.format_exc()}"
@@ -831,23 +1513,21 @@ class UFOOperator(object):
         # overwrite from fontTools.newDefaultLocation
         # we do not want this default location always to be mapped.
         loc = collections.OrderedDict()
-        for axisDescriptor in self.doc.axes:
+        axisTable = self.getAxisTable()
+        for axisDescriptor in axisTable.axes:
             axisName = axisDescriptor.name
-            axisValue = axisDescriptor.default
-            if discreteLocation is not None:
+            if discreteLocation is not None and axisName in discreteLocation:
                 # if we want to find the default for a specific discreteLoation
                 # we can not use the discrete axis' default value
                 # -> we have to use the value in the given discreteLocation
-                if axisDescriptor.name in discreteLocation:
-                    axisValue = discreteLocation[axisDescriptor.name]
-            else:
-                axisValue = axisDescriptor.default
-            if bend:
-                loc[axisName] = axisDescriptor.map_forward(
-                    axisValue
-                )
+                axisValue = discreteLocation[axisName]
+                if bend:
+                    axisValue = axisDescriptor.map_forward(axisValue)
+            elif bend:
+                axisValue = axisTable.mappedDefaults[axisName]
             else:
-                loc[axisName] = axisValue
+                axisValue = axisTable.defaults[axisName]
+            loc[axisName] = axisValue
         return loc
 
     def isAnisotropic(self, location):
@@ -877,6 +1557,8 @@ class UFOOperator(object):
         names = set([None, 'foreground'])
         for key, font in self.fonts.items():
             names.add(getDefaultLayerName(font))
+        for pendingSource in self.fonts.pending.values():
+            names.add(pendingSource["defaultLayerName"])
         return list(names)
 
     def getReverseComponentMapping(self, discreteLocation=None):
@@ -884,32 +1566,91 @@ class UFOOperator(object):
             Check if we're using fontParts or defcon
             Check which part of the designspace we're in.
         """
+        sourceDescriptor = self._getComponentMappingSource(discreteLocation)
+        if sourceDescriptor is None:
+            return {}
+        font = self.fonts.get(sourceDescriptor.name)
+        if font is None:
+            return {}
+        return self._readReverseComponentMapping(font)
+
+    def _getComponentMappingSource(self, discreteLocation=None):
+        # the local default source, the components are read from this font.
         if discreteLocation is not None:
             sources = self.findSourceDescriptorsForDiscreteLocation(discreteLocation)
         else:
             sources = self.doc.sources
         for sourceDescriptor in sources:
-            isDefault = self.isLocalDefault(sourceDescriptor.location)
-            if isDefault:
-                font = self.fonts.get(sourceDescriptor.name)
-                if font is None:
-                    return {}
-                if isinstance(font, defcon.objects.font.Font):
-                    # defcon
-                    reverseComponentMapping = {}
-                    for base, comps in font.componentReferences.items():
-                        for c in comps:
-                            if base not in reverseComponentMapping:
-                                reverseComponentMapping[base] = set()
-                            reverseComponentMapping[base].add(c)
-                else:
-                    if hasattr(font, "getReverseComponentMapping"):
-                        reverseComponentMapping = font.getReverseComponentMapping()
-                return reverseComponentMapping
+            if self.isLocalDefault(sourceDescriptor.location):
+                return sourceDescriptor
+        return None
+
+    def _readReverseComponentMapping(self, font):
+        if isinstance(font, defcon.objects.font.Font):
+            # defcon
+            reverseComponentMapping = {}
+            for base, comps in font.componentReferences.items():
+                for c in comps:
+                    if base not in reverseComponentMapping:
+                        reverseComponentMapping[base] = set()
+                    reverseComponentMapping[base].add(c)
+            return reverseComponentMapping
+        if hasattr(font, "getReverseComponentMapping"):
+            return font.getReverseComponentMapping()
         return {}
 
-    def generateUFOs(self, useVarlib=None, doRules=False):
-        # generate an UFO for each of the instance locations
+    def getComponentGraph(self, discreteLocation=None):
+        """Return the ComponentGraph for the default source of this discrete location."""
+        sourceDescriptor = self._getComponentMappingSource(discreteLocation)
+        if sourceDescriptor is None:
+            return None
+        return self.getSourceComponentGraph(sourceDescriptor.name)
+
+    def getSourceComponentGraph(self, sourceName):
+        """Return the ComponentGraph for the font of this source.
+            It is made once, glyphChanged() updates it for the changed glyph.
+            A new graph is made when the font object is replaced.
+        """
+        font = self.fonts.get(sourceName)
+        if font is None:
+            return None
+        componentGraph = self._getCachedSourceComponentGraph(sourceName)
+        if componentGraph is not None:
+            return componentGraph
+        componentGraph = ComponentGraph.fromReverseComponentMapping(self._readReverseComponentMapping(font))
+        self._componentGraphs[sourceName] = (font, componentGraph)
+        return componentGraph
+
+    def _getCachedSourceComponentGraph(self, sourceName):
+        # return the ComponentGraph of this source if it is made already, for the current font object.
+        cached = self._componentGraphs.get(sourceName)
+        if cached is not None and cached[0] is self.fonts.get(sourceName):
+            return cached[1]
+        return None
+
+    def _updateComponentGraphs(self, glyphName):
+        # read the components of this glyph again in the graphs we have
+        for font, componentGraph in self._componentGraphs.values():
+            if glyphName in font:
+                componentGraph.updateGlyph(glyphName, [component.baseGlyph for component in font[glyphName].components])
+            else:
+                componentGraph.removeGlyph(glyphName)
+
+    def generateUFOs(self, useVarlib=None, doRules=False, workers=None, incremental=False):
+        """ Generate an UFO for each of the instance locations.
+            workers: number of processes that make and save the instances.
+                Each process rebuilds this operator from the document and
+                the sources on disk. When the loaded sources have unsaved changes
+                the instances are made in this process.
+                With debug each process writes its own log, with the process id in the name.
+                None or 1 makes the instances one after the other.
+            incremental: only make and save the glyphs and font data whose sources,
+                location or settings changed since the last incremental run.
+                The digests are read from the saved sources,
+                and stored in the data folder of each instance UFO.
+                Instances with a loaded source that has unsaved changes are made completely.
+            Returns the list of paths of the generated UFOs.
+        """
         previousModel = self.useVarlib
         generatedFontPaths = []
         if useVarlib is not None:
@@ -918,44 +1659,261 @@ class UFOOperator(object):
         self.loadFonts()
         if self.debug:
             self.logger.info("## generateUFO")
-        for instanceDescriptor in self.doc.instances:
-            if self.debug:
-                self.logger.infoItem(f"Generating UFO at designspaceLocation {instanceDescriptor.getFullDesignLocation(self.doc)}")
-            if instanceDescriptor.path is None:
-                continue
-            pairs = None
-            bend = False
-            font = self.makeInstance(
-                instanceDescriptor,
-                doRules=doRules,
-                glyphNames=self.glyphNames,
-                decomposeComponents=False,
-                pairs=pairs,
-                bend=bend,
-            )
-            # update font info from the designspace lib
-            # https://fonttools.readthedocs.io/en/stable/designspaceLib/index.html#public-fontinfo
-            for infoDict in [
-                self.doc.lib.get("public.fontInfo", dict()),
-                instanceDescriptor.lib.get("public.fontInfo", dict())
-            ]:
-                for key, value in infoDict:
-                    setattr(font.info, key, value)
-
-            if self.debug:
-                self.logger.info(f"\t\t{os.path.basename(instanceDescriptor.path)}")
-
-            instanceFolder = os.path.dirname(instanceDescriptor.path)
-            if instanceFolder and not os.path.exists(instanceFolder):
-                os.makedirs(instanceFolder)
-            font.save(instanceDescriptor.path)
-            generatedFontPaths.append(instanceDescriptor.path)
-            glyphCount += len(font)
+        instanceDescriptors = [instanceDescriptor for instanceDescriptor in self.doc.instances if instanceDescriptor.path is not None]
+        if workers is not None and workers > 1 and len(instanceDescriptors) > 1:
+            if any(sourceDescriptor.font is not None for sourceDescriptor in self.doc.sources):
+                warn("generateUFOs: sources with font objects can not be sent to other processes, generating in this process.")
+                workers = None
+            elif not self.sourcesAreSaved():
+                # the processes read the sources from disk
+                warn("generateUFOs: the loaded sources have unsaved changes, generating in this process.")
+                workers = None
+        if workers is not None and workers > 1 and len(instanceDescriptors) > 1:
+            state = self._getProcessState()
+            # each process gets every nth instance, and makes its operator once.
+            chunks = [list(range(len(instanceDescriptors)))[i::workers] for i in range(workers)]
+            results = {}
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_generateUFOsInProcess, state, chunk, doRules, incremental) for chunk in chunks if chunk]
+                for future in futures:
+                    results.update(future.result())
+            for index, instanceDescriptor in enumerate(instanceDescriptors):
+                path, instanceGlyphCount = results[index]
+                if self.debug:
+                    self.logger.infoItem(f"Generated UFO at designspaceLocation {instanceDescriptor.getFullDesignLocation(self.doc)}")
+                    self.logger.info(f"\t\t{os.path.basename(path)}")
+                generatedFontPaths.append(path)
+                glyphCount += instanceGlyphCount
+        else:
+            glifHashes = GlifHashes()
+            for instanceDescriptor in instanceDescriptors:
+                if self.debug:
+                    self.logger.infoItem(f"Generating UFO at designspaceLocation {instanceDescriptor.getFullDesignLocation(self.doc)}")
+                path, instanceGlyphCount = self._generateUFO(instanceDescriptor, doRules=doRules, incremental=incremental, glifHashes=glifHashes)
+                generatedFontPaths.append(path)
+                glyphCount += instanceGlyphCount
         if self.debug:
             self.logger.info(f"\t\tGenerated {glyphCount} glyphs altogether.")
         self.useVarlib = previousModel
         return generatedFontPaths
 
+    def _generateUFO(self, instanceDescriptor, doRules=False, incremental=False, glifHashes=None):
+        # make and save the UFO for this instanceDescriptor
+        # return the path and the number of glyphs
+        digests = None
+        if incremental and not doRules:
+            # rules can swap any glyph, so they need all glyphs
+            if glifHashes is None:
+                glifHashes = GlifHashes()
+            digests = self.getInstanceDigests(instanceDescriptor, glifHashes)
+            if digests is not None:
+                manifest = self._readIncrementalManifest(instanceDescriptor.path)
+                if manifest is not None:
+                    glyphCount = self._updateUFO(instanceDescriptor, digests, manifest)
+                    self._writeIncrementalManifest(instanceDescriptor.path, digests)
+                    return instanceDescriptor.path, glyphCount
+        pairs = None
+        bend = False
+        font = self.makeInstance(
+            instanceDescriptor,
+            doRules=doRules,
+            glyphNames=self.glyphNames,
+            decomposeComponents=False,
+            pairs=pairs,
+            bend=bend,
+        )
+        self._addInstanceFontInfoLib(font, instanceDescriptor)
+
+        if self.debug:
+            self.logger.info(f"\t\t{os.path.basename(instanceDescriptor.path)}")
+
+        instanceFolder = os.path.dirname(instanceDescriptor.path)
+        if instanceFolder and not os.path.exists(instanceFolder):
+            os.makedirs(instanceFolder, exist_ok=True)
+        font.save(instanceDescriptor.path)
+        if digests is not None:
+            self._writeIncrementalManifest(instanceDescriptor.path, digests)
+        elif incremental:
+            # made from sources that are not saved, the next incremental run makes everything again
+            self._removeIncrementalManifest(instanceDescriptor.path)
+        return instanceDescriptor.path, len(font)
+
+    def _addInstanceFontInfoLib(self, font, instanceDescriptor):
+        # update font info from the designspace lib
+        # https://fonttools.readthedocs.io/en/stable/designspaceLib/index.html#public-fontinfo
+        for infoDict in [
+            self.doc.lib.get("public.fontInfo", dict()),
+            instanceDescriptor.lib.get("public.fontInfo", dict())
+        ]:
+            for key, value in infoDict:
+                setattr(font.info, key, value)
+
+    def getInstanceDigests(self, instanceDescriptor, glifHashes):
+        # return the digests for the incremental generateUFOs:
+        #   fontDigest: everything the kerning, info, groups, features and lib depend on
+        #   glyphDigests: a dict with glyphName: everything this instance glyph depends on
+        # return None if a source is only in memory, or has unsaved changes.
+        fullDesignLocation, continuousLocation, discreteLocation, locHorizontal, locVertical = self._getInstanceLocations(instanceDescriptor)
+        if discreteLocation:
+            sources = self.findSourceDescriptorsForDiscreteLocation(discreteLocation)
+        else:
+            sources = self.doc.sources
+        if not self.sourcesAreSaved(sources):
+            return None
+        fontFiles = []
+        for sourceDescriptor in sources:
+            if sourceDescriptor.font is not None:
+                return None
+            for fileName in self.incrementalFontFileNames:
+                fontFiles.append((sourceDescriptor.name, fileName, fileHash(os.path.join(sourceDescriptor.path, fileName))))
+        excludedGlyphNames = self.collectExcludedGlyphs()
+        fontKey = (
+            fontFiles,
+            instanceDescriptor.familyName,
+            instanceDescriptor.styleName,
+            instanceDescriptor.postScriptFontName,
+            instanceDescriptor.styleMapFamilyName,
+            instanceDescriptor.styleMapStyleName,
+            instanceDescriptor.kerning,
+            instanceDescriptor.lib,
+            sorted(fullDesignLocation.items()),
+            self.doc.lib,
+            self.useVarlib,
+            self.extrapolate,
+            self.roundGeometry,
+            self.libKeysForProcessing,
+            # the order of glyphNames depends on the hash seed of the process
+            sorted(self.glyphNames),
+            sorted(excludedGlyphNames),
+        )
+        fontDigest = hashlib.sha256(repr(fontKey).encode("utf-8")).hexdigest()
+        glyphDigests = {}
+        locationKey = (sorted(continuousLocation.items()), sorted(locHorizontal.items()), sorted(locVertical.items()), self.roundGeometry)
+        for glyphName in self.glyphNames:
+            if glyphName in excludedGlyphNames:
+                continue
+            glyphKey = (self.getMutatorCacheKey(glyphName, discreteLocation, glifHashes=glifHashes), locationKey)
+            glyphDigests[glyphName] = hashlib.sha256(repr(glyphKey).encode("utf-8")).hexdigest()
+        return fontDigest, glyphDigests
+
+    def _readIncrementalManifest(self, path):
+        # return the digests from the last incremental generateUFOs, or None
+        manifestPath = os.path.join(path, "data", self.incrementalManifestFileName)
+        if not os.path.exists(manifestPath):
+            return None
+        try:
+            with open(manifestPath, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except ValueError:
+            return None
+        if manifest.get("version") != 1:
+            return None
+        return manifest["font"], manifest["glyphs"]
+
+    def _removeIncrementalManifest(self, path):
+        manifestPath = os.path.join(path, "data", self.incrementalManifestFileName)
+        if os.path.exists(manifestPath):
+            os.remove(manifestPath)
+
+    def _writeIncrementalManifest(self, path, digests):
+        fontDigest, glyphDigests = digests
+        dataFolder = os.path.join(path, "data")
+        if not os.path.exists(dataFolder):
+            os.makedirs(dataFolder)
+        with open(os.path.join(dataFolder, self.incrementalManifestFileName), "w", encoding="utf-8") as f:
+            json.dump(dict(version=1, font=fontDigest, glyphs=glyphDigests), f, indent=0, sort_keys=True)
+
+    def _updateUFO(self, instanceDescriptor, digests, manifest):
+        # update the existing UFO for this instanceDescriptor:
+        # only the glyphs and font data with new digests are made and saved.
+        # return the number of glyphs.
+        fontDigest, glyphDigests = digests
+        previousFontDigest, previousGlyphDigests = manifest
+        fullDesignLocation, continuousLocation, discreteLocation, locHorizontal, locVertical = self._getInstanceLocations(instanceDescriptor)
+        font = self._instantiateFont(instanceDescriptor.path)
+        changedGlyphNames = [glyphName for glyphName, digest in glyphDigests.items() if previousGlyphDigests.get(glyphName) != digest]
+        removedGlyphNames = [glyphName for glyphName in previousGlyphDigests if glyphName not in glyphDigests]
+        if self.debug:
+            self.logger.info(f"\t\t{os.path.basename(instanceDescriptor.path)}: {len(changedGlyphNames)} changed glyphs, {len(removedGlyphNames)} removed glyphs")
+        if fontDigest != previousFontDigest:
+            # make the font data as makeInstance would, without the glyphs
+            newFont = self._instantiateFont(None)
+            self._addInstanceFontData(newFont, instanceDescriptor, fullDesignLocation, discreteLocation, locHorizontal)
+            if 'public.glyphOrder' not in newFont.lib.keys():
+                newFont.lib['public.glyphOrder'] = self.glyphNames
+            self._addInstanceLib(newFont, instanceDescriptor)
+            self._addInstanceFontInfoLib(newFont, instanceDescriptor)
+            for attribute in fontInfoAttributesVersion3:
+                if attribute == "guidelines":
+                    font.info.guidelines = [dict(guideline) for guideline in newFont.info.guidelines]
+                    continue
+                setattr(font.info, attribute, getattr(newFont.info, attribute))
+            font.kerning.clear()
+            font.kerning.update(newFont.kerning)
+            font.groups.clear()
+            font.groups.update(newFont.groups)
+            font.lib.clear()
+            font.lib.update(newFont.lib)
+            font.features.text = newFont.features.text
+        for glyphName in changedGlyphNames:
+            result = self._makeGlyphInstanceObject(glyphName, continuousLocation, discreteLocation, locHorizontal, locVertical)
+            if result is None:
+                if glyphName in font:
+                    del font[glyphName]
+                continue
+            glyphInstanceObject, unicodes = result
+            self._addInstanceGlyph(font, glyphName, glyphInstanceObject, unicodes)
+        for glyphName in removedGlyphNames:
+            if glyphName in font:
+                del font[glyphName]
+        font.save(instanceDescriptor.path)
+        return len(font)
+
+    def _getProcessState(self):
+        # everything another process needs to rebuild this operator
+        return dict(
+            operatorClass=self.__class__,
+            doc=self.doc,
+            ufoVersion=self.ufoVersion,
+            useVarlib=self.useVarlib,
+            extrapolate=self.extrapolate,
+            strict=self.strict,
+            roundGeometry=self.roundGeometry,
+            mutedAxisNames=self.mutedAxisNames,
+            libKeysForProcessing=self.libKeysForProcessing,
+            tempLib=self.tempLib,
+            glyphNames=self.glyphNames,
+            mutatorCache=self.mutatorCache,
+            debug=self.debug,
+            classes={name: getattr(self, name) for name in self.processClassAttributes},
+        )
+
+    @classmethod
+    def _fromProcessState(cls, state):
+        # rebuild an operator from _getProcessState()
+        operator = state["operatorClass"](
+            state["doc"],
+            ufoVersion=state["ufoVersion"],
+            useVarlib=state["useVarlib"],
+            extrapolate=state["extrapolate"],
+            strict=state["strict"],
+        )
+        if state["debug"]:
+            # the log of the calling process is not overwritten, each process writes its own log
+            docBaseName = os.path.splitext(operator.doc.path)[0]
+            operator.startLog(logPath=f"{docBaseName}_log_{os.getpid()}.txt")
+        for name, value in state["classes"].items():
+            setattr(operator, name, value)
+        operator.roundGeometry = state["roundGeometry"]
+        operator.mutedAxisNames = state["mutedAxisNames"]
+        operator.libKeysForProcessing = state["libKeysForProcessing"]
+        operator.tempLib = state["tempLib"]
+        operator.mutatorCache = state["mutatorCache"]
+        operator.loadFonts()
+        # keep the glyph order of the calling process
+        operator.glyphNames = state["glyphNames"]
+        return operator
+
     generateUFO = generateUFOs
 
     @memoize
@@ -1047,7 +2005,7 @@ class UFOOperator(object):
                 # XXX check sourceDescriptor layerName, only foreground should contribute
                 if sourceDescriptor.layerName is not None:
                     continue
-                if not os.path.exists(sourceDescriptor.path):
+                if not self.sourceIsAvailable(sourceDescriptor):
                     continue
                 if not sourceDescriptor.muteKerning:
                     sourceFont = self.fonts[sourceDescriptor.name]
@@ -1072,6 +2030,16 @@ class UFOOperator(object):
     @memoize
     def getGlyphMutator(self, glyphName, decomposeComponents=False, **discreteLocation):
         """make a mutator / varlib object for glyphName, with the sources for the given discrete location"""
+        mutatorCacheKey = None
+        if self.mutatorCache is not None and not decomposeComponents and self.sourceGlyphsAreSaved(glyphName, discreteLocation.get("discreteLocation")):
+            mutatorCacheKey = self.getMutatorCacheKey(glyphName, discreteLocation.get("discreteLocation"))
+            if mutatorCacheKey is not None:
+                cached = self.mutatorCache.get(mutatorCacheKey)
+                if cached is not None:
+                    thing, unicodes = cached
+                    if isinstance(thing, VariationModelMutator):
+                        thing.scalarCache = self.scalarCache
+                    return thing, unicodes
         items, unicodes = self.collectSourcesForGlyph(glyphName, decomposeComponents=decomposeComponents, **discreteLocation)
         new = []
         for a, b, c in items:
@@ -1091,14 +2059,111 @@ class UFOOperator(object):
             note = f"Error in getGlyphMutator for {glyphName}:\n{error}"
             if self.debug:
                 self.logger.info(note)
+        if mutatorCacheKey is not None and thing is not None:
+            self.mutatorCache.store(mutatorCacheKey, (thing, unicodes))
         return thing, unicodes
 
+    def sourcesAreSaved(self, sources=None):
+        # return False if one of the loaded source fonts has unsaved changes
+        # in the glyphs, layers, info, kerning, groups, features or lib.
+        # Pending sources are read from disk when they are needed.
+        if sources is None:
+            sources = self.doc.sources
+        for sourceDescriptor in sources:
+            if self.fonts.isPending(sourceDescriptor.name):
+                continue
+            font = self.fonts.get(sourceDescriptor.name)
+            if font is None:
+                continue
+            if hasattr(font, "naked"):
+                font = font.naked()
+            if getattr(font, "dirty", True):
+                return False
+        return True
+
+    def sourceGlyphsAreSaved(self, glyphName, discreteLocation=None):
+        # return False if the glyph has unsaved changes in one of the loaded source fonts,
+        # then the .glif files on disk do not describe the sources in memory.
+        # Pending sources are read from disk when they are needed.
+        if discreteLocation is not None:
+            sources = self.findSourceDescriptorsForDiscreteLocation(discreteLocation)
+        else:
+            sources = self.doc.sources
+        for sourceDescriptor in sources:
+            if self.fonts.isPending(sourceDescriptor.name):
+                continue
+            font = self.fonts.get(sourceDescriptor.name)
+            if font is None:
+                continue
+            if hasattr(font, "naked"):
+                font = font.naked()
+            if not isinstance(font, defcon.Font):
+                return False
+            if sourceDescriptor.layerName is None:
+                layer = font.layers.defaultLayer
+            else:
+                layer = getLayer(font, sourceDescriptor.layerName)
+                if layer is None:
+                    continue
+            if glyphName in layer:
+                if layer[glyphName].dirty:
+                    return False
+            elif layer.dirty:
+                # maybe the glyph was removed
+                return False
+        return True
+
+    def getMutatorCacheKey(self, glyphName, discreteLocation=None, glifHashes=None):
+        # return a key with everything the mutator for this glyph depends on:
+        # the .glif data in each source, the source locations, the axes and the settings.
+        # return None if a source is only in memory.
+        # Components are not decomposed, so only the glyph itself matters.
+        if glifHashes is None:
+            glifHashes = self.mutatorCache.glifHashes
+        if discreteLocation is not None:
+            sources = self.findSourceDescriptorsForDiscreteLocation(discreteLocation)
+        else:
+            sources = self.doc.sources
+        sourceKeys = []
+        for sourceDescriptor in sources:
+            if sourceDescriptor.font is not None:
+                return None
+            sourceKey = [sourceDescriptor.name, sourceDescriptor.layerName, tuple(sorted(sourceDescriptor.location.items()))]
+            if sourceDescriptor.path is None or not self.sourceIsAvailable(sourceDescriptor):
+                sourceKey.append(None)
+            else:
+                sourceKey.append(glyphName in sourceDescriptor.mutedGlyphNames)
+                sourceKey.append(glifHashes.glifHash(sourceDescriptor.path, sourceDescriptor.layerName, glyphName))
+            sourceKeys.append(tuple(sourceKey))
+        axisKeys = []
+        for axisDescriptor in self.doc.axes:
+            axisKeys.append((
+                axisDescriptor.__class__.__name__,
+                axisDescriptor.name,
+                getattr(axisDescriptor, "minimum", None),
+                axisDescriptor.default,
+                getattr(axisDescriptor, "maximum", None),
+                tuple(getattr(axisDescriptor, "values", None) or ()),
+                tuple(axisDescriptor.map or ()),
+            ))
+        mutedLocations = self.tempLib.get(self.mutedDesignLocationsLibKey)
+        settings = (
+            self.useVarlib,
+            self.extrapolate,
+            self.strict,
+            repr(self.mutedAxisNames),
+            repr(mutedLocations),
+            f"{self.mathGlyphClass.__module__}.{self.mathGlyphClass.__name__}",
+            f"{self.variationModelMutatorClass.__module__}.{self.variationModelMutatorClass.__name__}",
+        )
+        if discreteLocation is not None:
+            discreteLocation = tuple(sorted(discreteLocation.items()))
+        return ("getGlyphMutator", glyphName, discreteLocation, tuple(sourceKeys), tuple(axisKeys), settings)
+
     def isLocalDefault(self, location):
         # return True if location is a local default
         # check for bending
-        defaults = {}
-        for aD in self.doc.axes:
-            defaults[aD.name] = aD.map_forward(aD.default)
+        defaults = self.getAxisTable().mappedDefaults
         for axisName, value in location.items():
             if defaults[axisName] != value:
                 return False
@@ -1106,10 +2171,7 @@ class UFOOperator(object):
 
     def axesByName(self):
         # return a dict[axisName]: axisDescriptor
-        axes = {}
-        for aD in self.doc.axes:
-            axes[aD.name] = aD
-        return axes
+        return dict(self.getAxisTable().axesByName)
 
     def locationWillClip(self, location):
         # return True if this location will be clipped.
@@ -1129,10 +2191,10 @@ class UFOOperator(object):
         # return a copy of the design location without extrapolation
         # assume location is in designspace coordinates.
         # use map_forward on axis extremes,
-        axesByName = self.axesByName()
+        axisTable = self.getAxisTable()
         new = {}
         for axisName, value in location.items():
-            aD = axesByName.get(axisName)
+            aD = axisTable.axesByName.get(axisName)
             clippedValues = []
             if type(value) == tuple:
                 testValues = list(value)
@@ -1157,8 +2219,8 @@ class UFOOperator(object):
                         clippedValues.append(value)
                 else:
                     # a continuous axis
-                    aD_minimum = aD.map_forward(aD.minimum)
-                    aD_maximum = aD.map_forward(aD.maximum)
+                    aD_minimum = axisTable.mappedMinimums[axisName]
+                    aD_maximum = axisTable.mappedMaximums[axisName]
                     if value < aD_minimum:
                         clippedValues.append(aD_minimum)
                     elif value > aD_maximum:
@@ -1176,10 +2238,8 @@ class UFOOperator(object):
         # this means checking if the location is a non-default value
         if not mutedAxes:
             return False, location
-        defaults = {}
+        defaults = self.getAxisTable().defaults
         ignoreSource = False
-        for aD in self.doc.axes:
-            defaults[aD.name] = aD.default
         new = {}
         new.update(location)
         for mutedAxisName in mutedAxes:
@@ -1239,7 +2299,7 @@ class UFOOperator(object):
             sources = self.doc.sources
         unicodes = set()       # unicodes for this glyph
         for sourceDescriptor in sources:
-            if not os.path.exists(sourceDescriptor.path):
+            if not self.sourceIsAvailable(sourceDescriptor):
                 #kthxbai
                 note = "\tMissing UFO at %s" % sourceDescriptor.path
                 if self.debug:
@@ -1259,6 +2319,9 @@ class UFOOperator(object):
             ignoreSource, filteredLocation = self.filterThisLocation(sourceDescriptor.location, self.mutedAxisNames)
             if ignoreSource:
                 continue
+            if not self.sourceHasGlyph(sourceDescriptor, glyphName):
+                # no need to load a pending source for this
+                continue
             f = self.fonts.get(sourceDescriptor.name)
             if f is None:
                 continue
@@ -1294,30 +2357,10 @@ class UFOOperator(object):
                     foundEmpty = True
                     # sourceGlyphObject = None
                     # continue
-            if decomposeComponents:
-                # what about decomposing glyphs in a partial font?
-                temp = self.glyphClass()
-                sourceGlyphObject.drawPoints(
-                    DecomposePointPen(sourceLayer, temp.getPointPen())
-                )
-                temp.width = sourceGlyphObject.width
-                temp.name = sourceGlyphObject.name
-                temp.anchors = [dict(
-                    x=anchor.x,
-                    y=anchor.y,
-                    name=anchor.name,
-                    identifier=anchor.identifier,
-                    color=anchor.color
-                ) for anchor in sourceGlyphObject.anchors]
-                temp.guidelines = [dict(
-                    x=guideline.x,
-                    y=guideline.y,
-                    angle=guideline.angle,
-                    name=guideline.name,
-                    identifier=guideline.identifier,
-                    color=guideline.color
-                ) for guideline in sourceGlyphObject.guidelines]
-                processThis = temp
+            if asMathGlyph:
+                processThis = self._getSourceMathGlyph(sourceDescriptor.name, f, sourceLayer, layerName, sourceGlyphObject, decomposeComponents)
+            elif decomposeComponents:
+                processThis = self._decomposeSourceGlyph(sourceGlyphObject, sourceLayer)
             else:
                 processThis = sourceGlyphObject
             sourceInfo = dict(
@@ -1327,11 +2370,6 @@ class UFOOperator(object):
                 location=filteredLocation,  # sourceDescriptor.location,
                 sourceName=sourceDescriptor.name,
             )
-            if asMathGlyph:
-                if hasattr(processThis, "toMathGlyph"):
-                    processThis = processThis.toMathGlyph(strict=self.strict)
-                else:
-                    processThis = self.mathGlyphClass(processThis, strict=self.strict)
             continuous, discrete = self.splitLocation(loc)
             items.append((continuous, processThis, sourceInfo))
             empties.append((thisIsDefault, foundEmpty))
@@ -1359,6 +2397,71 @@ class UFOOperator(object):
                     checkedItems.append(items[i])
         return checkedItems, unicodes
 
+    def _decomposeSourceGlyph(self, sourceGlyphObject, sourceLayer):
+        # what about decomposing glyphs in a partial font?
+        temp = self.glyphClass()
+        sourceGlyphObject.drawPoints(
+            DecomposePointPen(sourceLayer, temp.getPointPen())
+        )
+        temp.width = sourceGlyphObject.width
+        temp.name = sourceGlyphObject.name
+        temp.anchors = [dict(
+            x=anchor.x,
+            y=anchor.y,
+            name=anchor.name,
+            identifier=anchor.identifier,
+            color=anchor.color
+        ) for anchor in sourceGlyphObject.anchors]
+        temp.guidelines = [dict(
+            x=guideline.x,
+            y=guideline.y,
+            angle=guideline.angle,
+            name=guideline.name,
+            identifier=guideline.identifier,
+            color=guideline.color
+        ) for guideline in sourceGlyphObject.guidelines]
+        return temp
+
+    def _getSourceGlyphChangeToken(self, sourceName, glyphName, sourceLayer, decomposeComponents):
+        # return a token that changes when glyphChanged is called for this glyph in this source.
+        # A decomposed glyph also changes with its base glyphs.
+        token = [(glyphName, self._glyphChangeCounts.get(glyphName, 0), self._sourceGlyphChangeCounts.get((sourceName, glyphName), 0))]
+        if decomposeComponents:
+            found = {glyphName}
+            todo = [glyphName]
+            while todo:
+                name = todo.pop()
+                if name not in sourceLayer:
+                    continue
+                for component in sourceLayer[name].components:
+                    baseGlyphName = component.baseGlyph
+                    if baseGlyphName not in found:
+                        found.add(baseGlyphName)
+                        todo.append(baseGlyphName)
+                        token.append((baseGlyphName, self._glyphChangeCounts.get(baseGlyphName, 0), self._sourceGlyphChangeCounts.get((sourceName, baseGlyphName), 0)))
+        return tuple(token)
+
+    def _getSourceMathGlyph(self, sourceName, font, sourceLayer, layerName, sourceGlyphObject, decomposeComponents):
+        # return the source glyph as a MathGlyph.
+        # The MathGlyph is made again after glyphChanged for the glyph in this source,
+        # or when the font object is replaced.
+        glyphName = sourceGlyphObject.name
+        key = (sourceName, layerName, glyphName, decomposeComponents, self.strict)
+        token = self._getSourceGlyphChangeToken(sourceName, glyphName, sourceLayer, decomposeComponents)
+        cached = self._sourceMathGlyphs.get(key)
+        if cached is not None and cached[0] is font and cached[1] == token:
+            return cached[2]
+        if decomposeComponents:
+            processThis = self._decomposeSourceGlyph(sourceGlyphObject, sourceLayer)
+        else:
+            processThis = sourceGlyphObject
+        if hasattr(processThis, "toMathGlyph"):
+            mathGlyph = processThis.toMathGlyph(strict=self.strict)
+        else:
+            mathGlyph = self.mathGlyphClass(processThis, strict=self.strict)
+        self._sourceMathGlyphs[key] = (font, token, mathGlyph)
+        return mathGlyph
+
     def collectMastersForGlyph(self, glyphName, decomposeComponents=False, discreteLocation=None):
         # compatibility thing for designspaceProblems.
         checkedItems, unicodes = self.collectSourcesForGlyph(glyphName, decomposeComponents=False, discreteLocation=None)
@@ -1445,10 +2548,94 @@ class UFOOperator(object):
             glyphNames=None,
             decomposeComponents=False,
             pairs=None,
-            bend=False):
-        """ Generate a font object for this instance """
+            bend=False,
+            workers=None):
+        """ Generate a font object for this instance
+            workers: number of processes that interpolate the glyphs.
+                Each process reads the sources from disk. When the loaded sources
+                have unsaved changes the glyphs are made in this process.
+                None or 1 makes the glyphs in this process.
+        """
         if isinstance(instanceDescriptor, dict):
             instanceDescriptor = self.doc.writerClass.instanceDescriptorClass(**instanceDescriptor)
+        fullDesignLocation, continuousLocation, discreteLocation, locHorizontal, locVertical = self._getInstanceLocations(instanceDescriptor)
+        font = self._instantiateFont(None)
+        self._addInstanceFontData(font, instanceDescriptor, fullDesignLocation, discreteLocation, locHorizontal, pairs=pairs)
+
+        # ok maybe now it is time to calculate some glyphs
+        # glyphs
+        if glyphNames:
+            selectedGlyphNames = glyphNames
+        else:
+            # since all glyphs are processed, decomposing components is unecessary
+            # maybe that's confusing and components should be decomposed anyway
+            # if decomposeComponents was set to True?
+            decomposeComponents = False
+            selectedGlyphNames = self.glyphNames
+        if 'public.glyphOrder' not in font.lib.keys():
+            # should be the glyphorder from the default, yes?
+            font.lib['public.glyphOrder'] = selectedGlyphNames
+        # remove exclude glyphs
+        selectedGlyphNames = [name for name in selectedGlyphNames if name not in self.collectExcludedGlyphs()]
+        referenceLocationForRules = None
+        if self.isAnisotropic(continuousLocation):
+            glyphReferenceLocation = locHorizontal
+        else:
+            glyphReferenceLocation = continuousLocation
+        # interpolate the base glyphs before the composites
+        # the glyphs are added to the font in the order of selectedGlyphNames
+        componentGraph = self.getComponentGraph(discreteLocation)
+        if componentGraph is not None:
+            orderedGlyphNames = componentGraph.topologicalOrder(selectedGlyphNames)
+        else:
+            orderedGlyphNames = selectedGlyphNames
+        glyphResults = None
+        if workers is not None and workers > 1 and len(selectedGlyphNames) > 1:
+            glyphResults = self._makeGlyphInstanceObjectsInProcesses(orderedGlyphNames, workers,
+                continuousLocation, discreteLocation, locHorizontal, locVertical,
+                decomposeComponents=decomposeComponents, bend=bend)
+        if glyphResults is None:
+            # no workers, or the sources can not be sent to other processes
+            glyphResults = {}
+            for glyphName in orderedGlyphNames:
+                glyphResults[glyphName] = self._makeGlyphInstanceObject(glyphName, continuousLocation, discreteLocation, locHorizontal, locVertical, decomposeComponents=decomposeComponents, bend=bend)
+        for glyphName in selectedGlyphNames:
+            result = glyphResults.get(glyphName)
+            if result is None:
+                continue
+            glyphInstanceObject, unicodes = result
+            referenceLocationForRules = glyphReferenceLocation
+            self._addInstanceGlyph(font, glyphName, glyphInstanceObject, unicodes)
+
+        # add designspace location to lib
+        # needs to happen after all glyphs are done
+        self._addInstanceLib(font, instanceDescriptor)
+
+        if doRules == True:
+            # experimental retrofitting of rule based swapping when making instances. 
+            # Q: in case of an anisotropic location, which value should trigger the rule? 
+            # This will use the horizontal component of the anisotropic location,
+            # or the whole location for executing the rules.
+            assert referenceLocationForRules is not None
+            resultNames = processRules(self.rules, referenceLocationForRules, self.glyphNames)
+            swapRecord = []
+            for oldName, newName in zip(self.glyphNames, resultNames):
+                if oldName != newName:
+                    swapGlyphNames(font, oldName, newName)
+                    swapRecord.append((oldName, newName))
+            if swapRecord:
+                font.lib['ufoProcessor.glyphsSwappedByRules'] = swapRecord
+            if self.debug:
+                note = f"makeInstance: processed the rules for {swapRecord}"
+                self.logger.info(note)
+
+        if self.debug:
+            self.logger.info(f"\t\t\t{len(selectedGlyphNames)} glyphs added")
+        return font
+
+    def _getInstanceLocations(self, instanceDescriptor):
+        # return the locations makeInstance needs for this instanceDescriptor:
+        # fullDesignLocation, continuousLocation, discreteLocation, locHorizontal, locVertical
         # hmm getFullDesignLocation does not support anisotropc locations?
         fullDesignLocation = instanceDescriptor.getFullDesignLocation(self.doc)
         anisotropic, continuousLocation, discreteLocation, locHorizontal, locVertical = self.getLocationType(fullDesignLocation)
@@ -1458,16 +2645,17 @@ class UFOOperator(object):
            # Axis values are in userspace, so this needs to happen before bending
            continuousLocation = self.clipDesignLocation(continuousLocation)
 
-        font = self._instantiateFont(None)
         loc = Location(continuousLocation)
-        anisotropic = False
         locHorizontal = locVertical = loc
         if self.isAnisotropic(loc):
-            anisotropic = True
             locHorizontal, locVertical = self.splitAnisotropic(loc)
             if self.debug:
                 self.logger.info(f"\t\t\tAnisotropic location for \"{instanceDescriptor.name}\"\n\t\t\t{fullDesignLocation}")
 
+        return fullDesignLocation, continuousLocation, discreteLocation, locHorizontal, locVertical
+
+    def _addInstanceFontData(self, font, instanceDescriptor, fullDesignLocation, discreteLocation, locHorizontal, pairs=None):
+        # add kerning, info, lib, groups and features to the instance font
         # makeOneKerning
         # discreteLocation ?
         if instanceDescriptor.kerning:
@@ -1519,107 +2707,94 @@ class UFOOperator(object):
             # copy features
             font.features.text = defaultSourceFont.features.text
 
-        # ok maybe now it is time to calculate some glyphs
-        # glyphs
-        if glyphNames:
-            selectedGlyphNames = glyphNames
-        else:
-            # since all glyphs are processed, decomposing components is unecessary
-            # maybe that's confusing and components should be decomposed anyway
-            # if decomposeComponents was set to True?
-            decomposeComponents = False
-            selectedGlyphNames = self.glyphNames
-        if 'public.glyphOrder' not in font.lib.keys():
-            # should be the glyphorder from the default, yes?
-            font.lib['public.glyphOrder'] = selectedGlyphNames
-        # remove exclude glyphs
-        selectedGlyphNames = [name for name in selectedGlyphNames if name not in self.collectExcludedGlyphs()]
-        for glyphName in selectedGlyphNames:
-            referenceLocationForRules = None
-            glyphMutator, unicodes = self.getGlyphMutator(glyphName, decomposeComponents=decomposeComponents, discreteLocation=discreteLocation)
-            if glyphMutator is None:
-                if self.debug:
-                    note = f"makeInstance: Could not make mutator for glyph {glyphName}"
-                    self.logger.info(note)
-                continue
-            font.newGlyph(glyphName)
-            font[glyphName].clear()
-            font[glyphName].unicodes = unicodes
+    def _addInstanceGlyph(self, font, glyphName, glyphInstanceObject, unicodes):
+        # add the glyph to the instance font
+        font.newGlyph(glyphName)
+        font[glyphName].clear()
+        font[glyphName].unicodes = unicodes
+        if self.roundGeometry:
             try:
-                if not self.isAnisotropic(continuousLocation):
-                    glyphInstanceObject = glyphMutator.makeInstance(continuousLocation, bend=bend)
-                    referenceLocationForRules = continuousLocation
-                else:
-                    # split anisotropic location into horizontal and vertical components
-                    horizontalGlyphInstanceObject = glyphMutator.makeInstance(locHorizontal, bend=bend)
-                    referenceLocationForRules = locHorizontal
-                    verticalGlyphInstanceObject = glyphMutator.makeInstance(locVertical, bend=bend)
-                    # merge them again in a beautiful single line:
-                    glyphInstanceObject = (1, 0) * horizontalGlyphInstanceObject + (0, 1) * verticalGlyphInstanceObject
-            except IndexError:
-                # alignment problem with the data?
+                glyphInstanceObject = glyphInstanceObject.round()
+            except AttributeError:
+                # what are we catching here?
+                # math objects without a round method?
                 if self.debug:
-                    note = f"makeInstance: Quite possibly some sort of data alignment error in {glyphName}"
+                    note = f"makeInstance: no round method for {glyphInstanceObject} ?"
                     self.logger.info(note)
-                continue
-            if self.roundGeometry:
-                try:
-                    glyphInstanceObject = glyphInstanceObject.round()
-                except AttributeError:
-                    # what are we catching here?
-                    # math objects without a round method?
-                    if self.debug:
-                        note = f"makeInstance: no round method for {glyphInstanceObject} ?"
-                        self.logger.info(note)
-            try:
-                # File "/Users/erik/code/ufoProcessor/Lib/ufoProcessor/__init__.py", line 649, in makeInstance
-                #   glyphInstanceObject.extractGlyph(font[glyphName], onlyGeometry=True)
-                # File "/Applications/RoboFont.app/Contents/Resources/lib/python3.6/fontMath/mathGlyph.py", line 315, in extractGlyph
-                #   glyph.anchors = [dict(anchor) for anchor in self.anchors]
-                # File "/Applications/RoboFont.app/Contents/Resources/lib/python3.6/fontParts/base/base.py", line 103, in __set__
-                #   raise FontPartsError("no setter for %r" % self.name)
-                #   fontParts.base.errors.FontPartsError: no setter for 'anchors'
-                if hasattr(font[glyphName], "fromMathGlyph"):
-                    font[glyphName].fromMathGlyph(glyphInstanceObject)
-                else:
-                    glyphInstanceObject.extractGlyph(font[glyphName], onlyGeometry=True)
-            except TypeError:
-                # this causes ruled glyphs to end up in the wrong glyphname
-                # but defcon2 objects don't support it
-                pPen = font[glyphName].getPointPen()
-                font[glyphName].clear()
-                glyphInstanceObject.drawPoints(pPen)
-            font[glyphName].width = glyphInstanceObject.width
-            
-        # add designspace location to lib
-        # needs to happen after all glyphs are done
+        try:
+            # File "/Users/erik/code/ufoProcessor/Lib/ufoProcessor/__init__.py", line 649, in makeInstance
+            #   glyphInstanceObject.extractGlyph(font[glyphName], onlyGeometry=True)
+            # File "/Applications/RoboFont.app/Contents/Resources/lib/python3.6/fontMath/mathGlyph.py", line 315, in extractGlyph
+            #   glyph.anchors = [dict(anchor) for anchor in self.anchors]
+            # File "/Applications/RoboFont.app/Contents/Resources/lib/python3.6/fontParts/base/base.py", line 103, in __set__
+            #   raise FontPartsError("no setter for %r" % self.name)
+            #   fontParts.base.errors.FontPartsError: no setter for 'anchors'
+            if hasattr(font[glyphName], "fromMathGlyph"):
+                font[glyphName].fromMathGlyph(glyphInstanceObject)
+            else:
+                glyphInstanceObject.extractGlyph(font[glyphName], onlyGeometry=True)
+        except TypeError:
+            # this causes ruled glyphs to end up in the wrong glyphname
+            # but defcon2 objects don't support it
+            pPen = font[glyphName].getPointPen()
+            font[glyphName].clear()
+            glyphInstanceObject.drawPoints(pPen)
+        font[glyphName].width = glyphInstanceObject.width
+
+    def _addInstanceLib(self, font, instanceDescriptor):
+        # add the designspace location and the math model to the instance lib
         font.lib['ufoProcessor.fullDesignspaceLocation'] = list(instanceDescriptor.getFullDesignLocation(self.doc).items())
         if self.useVarlib:
             font.lib['ufoProcessor.mathmodel'] = "fonttools.varlib"
         else:
             font.lib['ufoProcessor.mathmodel'] = "mutatorMath"
 
-        if doRules == True:
-            # experimental retrofitting of rule based swapping when making instances. 
-            # Q: in case of an anisotropic location, which value should trigger the rule? 
-            # This will use the horizontal component of the anisotropic location,
-            # or the whole location for executing the rules.
-            assert referenceLocationForRules is not None
-            resultNames = processRules(self.rules, referenceLocationForRules, self.glyphNames)
-            swapRecord = []
-            for oldName, newName in zip(self.glyphNames, resultNames):
-                if oldName != newName:
-                    swapGlyphNames(font, oldName, newName)
-                    swapRecord.append((oldName, newName))
-            if swapRecord:
-                font.lib['ufoProcessor.glyphsSwappedByRules'] = swapRecord
+    def _makeGlyphInstanceObject(self, glyphName, continuousLocation, discreteLocation, locHorizontal, locVertical, decomposeComponents=False, bend=False):
+        # make the math glyph for this glyph in makeInstance.
+        # return (glyphInstanceObject, unicodes) or None
+        glyphMutator, unicodes = self.getGlyphMutator(glyphName, decomposeComponents=decomposeComponents, discreteLocation=discreteLocation)
+        if glyphMutator is None:
             if self.debug:
-                note = f"makeInstance: processed the rules for {swapRecord}"
+                note = f"makeInstance: Could not make mutator for glyph {glyphName}"
                 self.logger.info(note)
-
-        if self.debug:
-            self.logger.info(f"\t\t\t{len(selectedGlyphNames)} glyphs added")
-        return font
+            return None
+        try:
+            if not self.isAnisotropic(continuousLocation):
+                glyphInstanceObject = glyphMutator.makeInstance(continuousLocation, bend=bend)
+            else:
+                # split anisotropic location into horizontal and vertical components
+                horizontalGlyphInstanceObject = glyphMutator.makeInstance(locHorizontal, bend=bend)
+                verticalGlyphInstanceObject = glyphMutator.makeInstance(locVertical, bend=bend)
+                # merge them again in a beautiful single line:
+                glyphInstanceObject = (1, 0) * horizontalGlyphInstanceObject + (0, 1) * verticalGlyphInstanceObject
+        except IndexError:
+            # alignment problem with the data?
+            if self.debug:
+                note = f"makeInstance: Quite possibly some sort of data alignment error in {glyphName}"
+                self.logger.info(note)
+            return None
+        return glyphInstanceObject, unicodes
+
+    def _makeGlyphInstanceObjectsInProcesses(self, glyphNames, workers, continuousLocation, discreteLocation, locHorizontal, locVertical, decomposeComponents=False, bend=False):
+        # make the math glyphs for these glyphs in a number of processes.
+        # return a dict with glyphName: (glyphInstanceObject, unicodes)
+        # or None if the sources can not be sent to other processes.
+        if any(sourceDescriptor.font is not None for sourceDescriptor in self.doc.sources):
+            warn("makeInstance: sources with font objects can not be sent to other processes, making glyphs in this process.")
+            return None
+        if not self.sourcesAreSaved():
+            # the processes read the sources from disk
+            warn("makeInstance: the loaded sources have unsaved changes, making glyphs in this process.")
+            return None
+        # larger chunks mean fewer round trips, more chunks than workers balance the load.
+        chunkSize = max(1, len(glyphNames) // (workers * 4))
+        chunks = [glyphNames[i:i + chunkSize] for i in range(0, len(glyphNames), chunkSize)]
+        arguments = (continuousLocation, discreteLocation, locHorizontal, locVertical, decomposeComponents, bend)
+        results = {}
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_initProcessOperator, initargs=(self._getProcessState(),)) as executor:
+            for chunkResults in executor.map(_makeGlyphInstanceObjectsInProcess, chunks, itertools.repeat(arguments)):
+                results.update(chunkResults)
+        return results
 
     def locationToDescriptiveString(self, loc):
         # make a nice descriptive string from the location
@@ -1804,6 +2979,80 @@ class UFOOperator(object):
         self.useVarlib = previousModel
         return glyphInstanceObject
 
+    def makeGlyphsAtLocations(self, glyphName, locations, decomposeComponents=True, useVarlib=False, roundGeometry=False):
+        """
+        Make instances of one glyph at a number of locations.
+        glyphName:
+        locations: list of locations including discrete axes, in **designspace** coordinates.
+        decomposeComponents, useVarlib: as in makeOneGlyph
+        roundGeometry: round all geometry to integers
+
+        The locations are grouped by discrete location, and each group
+        is calculated in one go with the mutator from getGlyphMutator.
+
+        Returns: a list of mathglyphs, in the order of the locations.
+            None for locations that could not be made.
+        """
+        self.loadFonts()
+        previousModel = self.useVarlib
+        self.useVarlib = useVarlib
+        bend = False
+        results = [None] * len(locations)
+        # discreteLocation key: (discreteLocation, [(index, location parts)])
+        groups = {}
+        for index, location in enumerate(locations):
+            continuousLocation, discreteLocation = self.splitLocation(location)
+            if not self.extrapolate:
+                continuousLocation = self.clipDesignLocation(continuousLocation)
+            if discreteLocation is not None:
+                if not self.checkDiscreteAxisValues(discreteLocation):
+                    if self.debug:
+                        self.logger.info(f"\t\tmakeGlyphsAtLocations reports: {location} has illegal value for discrete location")
+                    continue
+                discreteKey = tuple(sorted(discreteLocation.items()))
+            else:
+                discreteKey = None
+            if self.isAnisotropic(location):
+                # split anisotropic location into horizontal and vertical components
+                parts = self.splitAnisotropic(Location(continuousLocation))
+            else:
+                parts = (continuousLocation, )
+            if discreteKey not in groups:
+                groups[discreteKey] = (discreteLocation, [])
+            groups[discreteKey][1].append((index, parts))
+        for discreteLocation, items in groups.values():
+            glyphMutator, unicodes = self.getGlyphMutator(glyphName, decomposeComponents=decomposeComponents, discreteLocation=discreteLocation)
+            if not glyphMutator:
+                continue
+            mutatorLocations = [part for index, parts in items for part in parts]
+            try:
+                if hasattr(glyphMutator, "makeInstances"):
+                    instances = glyphMutator.makeInstances(mutatorLocations, bend=bend)
+                else:
+                    instances = [glyphMutator.makeInstance(mutatorLocation, bend=bend) for mutatorLocation in mutatorLocations]
+            except IndexError:
+                # alignment problem with the data?
+                if self.debug:
+                    note = f"makeGlyphsAtLocations: Quite possibly some sort of data alignment error in {glyphName}"
+                    self.logger.info(note)
+                continue
+            instances = iter(instances)
+            for index, parts in items:
+                if len(parts) == 1:
+                    glyphInstanceObject = next(instances)
+                else:
+                    horizontalGlyphInstanceObject = next(instances)
+                    verticalGlyphInstanceObject = next(instances)
+                    # merge them again
+                    glyphInstanceObject = (1, 0) * horizontalGlyphInstanceObject + (0, 1) * verticalGlyphInstanceObject
+                if glyphInstanceObject:
+                    glyphInstanceObject.unicodes = unicodes
+                    if roundGeometry:
+                        glyphInstanceObject = glyphInstanceObject.round()
+                results[index] = glyphInstanceObject
+        self.useVarlib = previousModel
+        return results
+
     def makeOneInfo(self, location, roundGeometry=False, clip=False):
         """ Make the fontMath.mathInfo object for this location.
             You need to extract this to an instance font.
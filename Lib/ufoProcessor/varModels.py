@@ -1,7 +1,15 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import print_function, division, absolute_import
+import collections
+from copy import deepcopy
 from fontTools.varLib.models import VariationModel, normalizeLocation
+from fontMath.mathGlyph import MathGlyph
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 # alternative axisMapper that uses map_forward and map_backward from fonttools
@@ -52,15 +60,60 @@ class AxisMapper(object):
 
 
 
+class ScalarCache(object):
+    """ master scalars for locations, for mutators with the same master locations,
+        with the index of the master at the location, if there is one.
+        The least recently used scalars are removed when there are more than maxEntries.
+    """
+
+    def __init__(self, maxEntries=10000):
+        self.maxEntries = maxEntries
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        scalars = self._entries.get(key)
+        if scalars is not None:
+            self._entries.move_to_end(key)
+        return scalars
+
+    def store(self, key, scalars):
+        self._entries[key] = scalars
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
 class VariationModelMutator(object):
     """ a thing that looks like a mutator on the outside,
         but uses the fonttools varlib logic to calculate.
+
+        interpolateFromDeltas:
+            False: each instance is the sum of the masters multiplied by their master scalars.
+            True: the deltas of the masters are calculated once for each mutator,
+            each instance is the sum of the deltas multiplied by the support scalars.
+            The results can be different in the last bits of the floats.
+            Versions of fontTools without VariationModel.getMasterScalars need the deltas.
     """
 
-    def __init__(self, items, axes, model=None, extrapolate=True):
+    interpolateFromDeltas = not hasattr(VariationModel, "getMasterScalars")
+    # the scalar cache belongs to the operator, the model can be shared with the modelPool.
+    # They are not counted in the size of the mutator in the memoize cache.
+    sharedAttributes = ("scalarCache", "model")
+
+    def __init__(self, items, axes, model=None, extrapolate=True, scalarCache=None, modelPool=None):
         # items: list of locationdict, value tuples
         # axes: list of axis dictionaries, not axisdescriptor objects.
         # model: a model, if we want to share one
+        # scalarCache: a ScalarCache, if we want to share the scalars
+        #   with other mutators for the same axes.
+        # modelPool: a dict, if we want to share the models
+        #   with other mutators for the same axes and master locations.
         self.extrapolate = extrapolate
         self.axisOrder = [a.name for a in axes]
         self.axisMapper = AxisMapper(axes)
@@ -73,11 +126,29 @@ class VariationModelMutator(object):
         if model is None:
             dd = [self._normalize(a) for a,b in items]
             ee = self.axisOrder
-            self.model = VariationModel(dd, axisOrder=ee, extrapolate=self.extrapolate)
+            if modelPool is not None:
+                modelKey = (tuple(ee), self.extrapolate, tuple(tuple(sorted(d.items())) for d in dd))
+                self.model = modelPool.get(modelKey)
+                if self.model is None:
+                    self.model = modelPool[modelKey] = VariationModel(dd, axisOrder=ee, extrapolate=self.extrapolate)
+            else:
+                self.model = VariationModel(dd, axisOrder=ee, extrapolate=self.extrapolate)
         else:
             self.model = model
         self.masters = [b for a, b in items]
         self.locations = [a for a, b in items]
+        self.deltas = None
+        self.scalarCache = scalarCache
+        # the scalars only depend on the master locations
+        self.scalarKey = (self.model.extrapolate, tuple(tuple(sorted(location.items())) for location in self.model.origLocations))
+        # normalized master location: index of the master
+        self.masterIndex = {masterKey: index for index, masterKey in enumerate(self.scalarKey[1])}
+
+    def __getstate__(self):
+        # the scalarCache belongs to the operator
+        state = dict(self.__dict__)
+        state["scalarCache"] = None
+        return state
 
     def getAxisMinMax(self, axis):
         # return tha axis.minimum and axis.maximum for continuous axes
@@ -87,10 +158,23 @@ class VariationModelMutator(object):
         return axis.minimum, axis.maximum
 
     def get(self, key):
-        if key in self.model.locations:
-            i = self.model.locations.index(key)
-            return self.masters[i]
-        return None
+        # return the master at this normalized location, or None
+        index = self.masterIndex.get(tuple(sorted((axisName, value) for axisName, value in key.items() if value != 0)))
+        if index is None:
+            return None
+        return self.masters[index]
+
+    def getMasterInstance(self, location, bend=False):
+        # return a copy of the master if the location is a master location, or None.
+        # At a master location the master has scalar 1 and all the others have 0,
+        # so the scalars are not needed.
+        return self._copyMaster(self._getLocationEntry(location, bend)[1])
+
+    def _copyMaster(self, masterIndex):
+        # Multiplied by 1.0 to get the same values as the interpolation, floats.
+        if masterIndex is None:
+            return None
+        return self.masters[masterIndex] * 1.0
 
     def getFactors(self, location):
         nl = self._normalize(location)
@@ -109,17 +193,236 @@ class VariationModelMutator(object):
             items.append((self.masters[sortedOrder], s))
         return items
 
+    def getDeltas(self):
+        # the deltas of the masters, in the order of the model supports.
+        # calculated once, with the first instance.
+        if self.deltas is None:
+            self.deltas = self.model.getDeltas(self.masters)
+        return self.deltas
+
+    def getInterpolationValues(self):
+        # the values that are multiplied by the scalars from getLocationScalars
+        if self.interpolateFromDeltas:
+            return self.getDeltas()
+        return self.masters
+
+    def interpolate(self, scalars):
+        return self.model.interpolateFromDeltasAndScalars(self.getInterpolationValues(), scalars)
+
     def makeInstance(self, location, bend=False):
         # check for anisotropic locations here
+        scalars, masterIndex = self._getLocationEntry(location, bend)
+        if masterIndex is not None:
+            return self._copyMaster(masterIndex)
+        return self.interpolate(scalars)
+
+    def makeInstances(self, locations, bend=False):
+        # make instances for a list of locations.
+        # the scalars for all locations are calculated first.
+        return [self.interpolate(scalars) for scalars in self.getMasterScalars(locations, bend=bend)]
+
+    def getMasterScalars(self, locations, bend=False):
+        # return the scalars for each of these locations
+        return [self.getLocationScalars(location, bend=bend) for location in locations]
+
+    def getLocationScalars(self, location, bend=False):
+        # return the scalars for this location:
+        # the master scalars, or the support scalars if interpolateFromDeltas is True.
+        # Mutators with the same master locations share the scalars in the scalarCache.
+        # Don't change the list.
+        return self._getLocationEntry(location, bend)[0]
+
+    def _getLocationEntry(self, location, bend):
+        # return the scalars for this location, and the index of the master at this location or None.
+        # Both are kept in the scalarCache, so a location is normalized once.
+        if self.scalarCache is not None:
+            key = (self.scalarKey, self.interpolateFromDeltas, bend, tuple(sorted(location.items())))
+            entry = self.scalarCache.get(key)
+            if entry is not None:
+                return entry
         if bend:
             location = self.axisMapper(location)
-        nl = self._normalize(location)
-        return self.model.interpolateFromMasters(nl, self.masters)
+        normalizedLocation = self._normalize(location)
+        if self.interpolateFromDeltas:
+            scalars = self.model.getScalars(normalizedLocation)
+        else:
+            scalars = self.model.getMasterScalars(normalizedLocation)
+        masterIndex = self.masterIndex.get(tuple(sorted((axisName, value) for axisName, value in normalizedLocation.items() if value != 0)))
+        entry = (scalars, masterIndex)
+        if self.scalarCache is not None:
+            self.scalarCache.store(key, entry)
+        return entry
 
     def _normalize(self, location):
         return normalizeLocation(location, self.axes)
 
 
+def getMathGlyphStructure(glyph):
+    # return a hashable description of everything in this MathGlyph
+    # that is not interpolated. Masters with the same structure
+    # are paired by index by fontMath, so their coordinates can be
+    # interpolated as flat arrays.
+    # return None if the glyph has data we can't flatten.
+    if type(glyph) is not MathGlyph:
+        return None
+    if not glyph.scaleComponentTransform:
+        return None
+    if glyph.width is None or glyph.height is None:
+        return None
+    if glyph.guidelines or glyph.image is None:
+        return None
+    anchorNames = [anchor.get("name") for anchor in glyph.anchors]
+    if len(set(anchorNames)) != len(anchorNames):
+        # fontMath groups anchors with the same name
+        return None
+    return (
+        tuple(len(contour["points"]) for contour in glyph.contours),
+        tuple((component["baseGlyph"], component["identifier"]) for component in glyph.components),
+        tuple((anchor.get("name"), anchor.get("identifier")) for anchor in glyph.anchors),
+        glyph.image["fileName"],
+    )
+
+
+def getMathGlyphValues(glyph):
+    # return all the numbers in this MathGlyph in a flat list
+    # in the order of getMathGlyphStructure
+    values = [glyph.width, glyph.height]
+    for contour in glyph.contours:
+        for point in contour["points"]:
+            values.extend(point[1])
+    for component in glyph.components:
+        values.extend(component["transformation"])
+    for anchor in glyph.anchors:
+        values.append(anchor["x"])
+        values.append(anchor["y"])
+    values.extend(glyph.image["transformation"])
+    return values
+
+
+class NumpyVariationModelMutator(VariationModelMutator):
+    """ a VariationModelMutator that interpolates MathGlyph masters
+        as a single numpy array. The coordinates of the masters are
+        flattened once, each instance is a sum of scaled arrays.
+        The results are the same as the fontMath results.
+        Masters that are not compatible, or not MathGlyphs,
+        are interpolated by the VariationModelMutator.
+    """
+
+    def __init__(self, items, axes, model=None, extrapolate=True, scalarCache=None, modelPool=None):
+        super(NumpyVariationModelMutator, self).__init__(items, axes, model=model, extrapolate=extrapolate, scalarCache=scalarCache, modelPool=modelPool)
+        self.masterValues = None
+        if numpy is None or not self.masters:
+            return
+        structures = set(getMathGlyphStructure(master) for master in self.masters)
+        if len(structures) != 1 or None in structures:
+            return
+        # the rows are in the order of the scalars
+        if self.interpolateFromDeltas:
+            self.valueMasters = [self.masters[index] for index in self.model.reverseMapping]
+        else:
+            self.valueMasters = self.masters
+        self.masterValues = numpy.array([getMathGlyphValues(value) for value in self.getInterpolationValues()], dtype=float)
+
+    def makeInstanceValues(self, location, bend=False):
+        # return the interpolated values as a numpy array,
+        # the index of the first row that contributes and the number of rows that contribute.
+        # Add the scaled rows in the same order as
+        # VariationModel.interpolateFromValuesAndScalars so the floats match.
+        return self._addRows(self.getLocationScalars(location, bend=bend))
+
+    def _addRows(self, scalars):
+        values = None
+        firstIndex = None
+        contributions = 0
+        for index, scalar in enumerate(scalars):
+            if not scalar:
+                continue
+            contribution = self.masterValues[index] * scalar
+            if values is None:
+                values = contribution
+                firstIndex = index
+            else:
+                # contribution is a new array, so it can be added in place
+                values += contribution
+            contributions += 1
+        return values, firstIndex, contributions
+
+    def makeInstance(self, location, bend=False):
+        if self.masterValues is None:
+            return super(NumpyVariationModelMutator, self).makeInstance(location, bend=bend)
+        scalars, masterIndex = self._getLocationEntry(location, bend)
+        if masterIndex is not None:
+            return self._copyMaster(masterIndex)
+        values, firstIndex, contributions = self._addRows(scalars)
+        if values is None:
+            return None
+        return self.makeMathGlyph(values.tolist(), self.valueMasters[firstIndex], contributions)
+
+    def makeInstancesValues(self, locations, bend=False):
+        # return the interpolated values for these locations as a 2d numpy array,
+        # one row for each location, and the array of master scalars.
+        # Masters with a zero scalar are skipped, as in makeInstanceValues.
+        # The rows start at -0.0 so the first contribution is added without changing it.
+        scalars = numpy.array(self.getMasterScalars(locations, bend=bend), dtype=float).reshape(len(locations), len(self.masters))
+        values = numpy.full((len(locations), self.masterValues.shape[1]), -0.0)
+        for index in range(len(self.masters)):
+            masterScalars = scalars[:, index]
+            contributing = masterScalars != 0
+            if not contributing.any():
+                continue
+            values[contributing] += masterScalars[contributing, None] * self.masterValues[index]
+        return values, scalars
+
+    def makeInstances(self, locations, bend=False):
+        if self.masterValues is None:
+            return super(NumpyVariationModelMutator, self).makeInstances(locations, bend=bend)
+        values, scalars = self.makeInstancesValues(locations, bend=bend)
+        results = []
+        for locationValues, locationScalars in zip(values, scalars):
+            contributing = numpy.flatnonzero(locationScalars)
+            if not len(contributing):
+                results.append(None)
+                continue
+            results.append(self.makeMathGlyph(locationValues.tolist(), self.valueMasters[contributing[0]], len(contributing)))
+        return results
+
+    def makeMathGlyph(self, values, master, contributions=1):
+        # make a MathGlyph with the structure of this master and these values.
+        # fontMath rebuilds the anchors when it adds glyphs.
+        glyph = MathGlyph(None, scaleComponentTransform=master.scaleComponentTransform, strict=master.strict)
+        glyph.name = master.name
+        if master.unicodes is not None:
+            glyph.unicodes = list(master.unicodes)
+        glyph.note = master.note
+        glyph.lib = deepcopy(dict(master.lib))
+        glyph.width = values[0]
+        glyph.height = values[1]
+        index = 2
+        for contour in master.contours:
+            masterPoints = contour["points"]
+            end = index + 2 * len(masterPoints)
+            coordinates = zip(values[index:end:2], values[index + 1:end:2])
+            points = [(point[0], pt, point[2], point[3], point[4]) for point, pt in zip(masterPoints, coordinates)]
+            glyph.contours.append(dict(identifier=contour["identifier"], points=points))
+            index = end
+        for component in master.components:
+            component = dict(component)
+            component["transformation"] = tuple(values[index:index + 6])
+            index += 6
+            glyph.components.append(component)
+        for anchor in master.anchors:
+            if contributions > 1:
+                anchor = dict(name=anchor.get("name"), identifier=anchor.get("identifier"), x=None, y=None, color=anchor.get("color"))
+            else:
+                anchor = dict(anchor)
+            anchor["x"] = values[index]
+            anchor["y"] = values[index + 1]
+            index += 2
+            glyph.anchors.append(anchor)
+        glyph.image = dict(fileName=master.image["fileName"], transformation=tuple(values[index:index + 6]), color=master.image["color"])
+        return glyph
+
+
 if __name__ == "__main__":
     from fontTools.designspaceLib import AxisDescriptor
     a = AxisDescriptor()
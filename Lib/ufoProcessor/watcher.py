@@ -0,0 +1,217 @@
+import os
+import threading
+
+import defcon
+from fontTools.misc import plistlib
+
+
+class SourceWatcher(object):
+    """ Polls the files of the source UFOs of a UFOOperator.
+
+        Changed .glif files are mapped back to the sources and the glyph names.
+        Only those glyphs, or the changed kerning, info, groups, lib or features,
+        are read again, and only their mutators are removed from the cache.
+        When glyphs are added or removed, the source font is loaded again.
+
+        No OS specific file notifications, it compares the modification times
+        and sizes of the files. Call poll() from your own loop, or run().
+        poll() and run() update the operator without a lock: call them
+        from the thread that uses the operator.
+    """
+
+    # file name: name of the font data for UFOOperator.fontDataChanged
+    fontDataFileNames = {
+        "fontinfo.plist": "info",
+        "kerning.plist": "kerning",
+        "groups.plist": "groups",
+        "lib.plist": "lib",
+        "features.fea": "features",
+    }
+    # changes in these files can add or remove glyphs or layers
+    structureFileNames = ("metainfo.plist", "layercontents.plist", "contents.plist")
+
+    def __init__(self, operator):
+        self.operator = operator
+        self._stopped = threading.Event()
+        # ufo path: snapshot
+        self._snapshots = {}
+        for path in self._sourcePaths():
+            self._snapshots[path] = self._takeSnapshot(path)
+
+    def _sourcePaths(self):
+        # return a dict with ufo path: source descriptors
+        paths = {}
+        for sourceDescriptor in self.operator.doc.sources:
+            if sourceDescriptor.path is None:
+                continue
+            if sourceDescriptor.path not in paths:
+                paths[sourceDescriptor.path] = []
+            paths[sourceDescriptor.path].append(sourceDescriptor)
+        return paths
+
+    def _takeSnapshot(self, path, previous=None):
+        # return the modification times and sizes of the files we watch in this UFO,
+        # and for each glyph folder the layer name and the glyph names by file name.
+        # The glyph names are only read again when contents.plist changed.
+        if not os.path.exists(path):
+            return None
+        files = {}
+        for fileName in list(self.fontDataFileNames) + ["metainfo.plist", "layercontents.plist"]:
+            filePath = os.path.join(path, fileName)
+            if os.path.exists(filePath):
+                stat = os.stat(filePath)
+                files[fileName] = (stat.st_mtime_ns, stat.st_size)
+        layerContentsPath = os.path.join(path, "layercontents.plist")
+        if os.path.exists(layerContentsPath):
+            with open(layerContentsPath, "rb") as f:
+                layerContents = plistlib.load(f)
+        else:
+            # UFO 2
+            layerContents = [("public.default", "glyphs")]
+        layers = {}
+        for layerName, folderName in layerContents:
+            folderPath = os.path.join(path, folderName)
+            if not os.path.exists(folderPath):
+                continue
+            for entry in os.scandir(folderPath):
+                if entry.name.endswith(".glif") or entry.name == "contents.plist":
+                    stat = entry.stat()
+                    files[f"{folderName}/{entry.name}"] = (stat.st_mtime_ns, stat.st_size)
+            contentsKey = f"{folderName}/contents.plist"
+            if previous is not None and folderName in previous["layers"] and previous["files"].get(contentsKey) == files.get(contentsKey):
+                glyphNames = previous["layers"][folderName][1]
+            else:
+                glyphNames = {}
+                contentsPath = os.path.join(folderPath, "contents.plist")
+                if os.path.exists(contentsPath):
+                    with open(contentsPath, "rb") as f:
+                        glyphNames = {fileName: glyphName for glyphName, fileName in plistlib.load(f).items()}
+            layers[folderName] = (layerName, glyphNames)
+        return dict(files=files, layers=layers)
+
+    def poll(self):
+        """ Check the source UFOs for changed files, and update the operator.
+            Returns a dict with ufo path: changes. Empty if nothing changed.
+            changes is a dict with
+                glyphs: dict with layer name: set of glyph names
+                fontData: set of "info", "kerning", "groups", "lib", "features"
+                structure: True if glyphs or layers were added or removed
+        """
+        allChanges = {}
+        for path, sourceDescriptors in self._sourcePaths().items():
+            previous = self._snapshots.get(path)
+            current = self._takeSnapshot(path, previous)
+            self._snapshots[path] = current
+            if previous is None and current is None:
+                continue
+            if previous is None or current is None:
+                changes = dict(glyphs={}, fontData=set(self.fontDataFileNames.values()), structure=True)
+            else:
+                changedFiles = [fileName for fileName in set(previous["files"]) | set(current["files"]) if previous["files"].get(fileName) != current["files"].get(fileName)]
+                if not changedFiles:
+                    continue
+                changes = self._describeChanges(previous, current, changedFiles)
+            self._updateOperator(path, sourceDescriptors, changes)
+            allChanges[path] = changes
+        return allChanges
+
+    def _describeChanges(self, previous, current, changedFiles):
+        glyphs = {}
+        fontData = set()
+        structure = False
+        for fileName in changedFiles:
+            if fileName in self.fontDataFileNames:
+                fontData.add(self.fontDataFileNames[fileName])
+                continue
+            folderName, _, glifFileName = fileName.rpartition("/")
+            if glifFileName in self.structureFileNames:
+                structure = True
+                continue
+            # the glyph name from the current contents.plist, or the previous one if the file was removed
+            for snapshot in (current, previous):
+                layerName, glyphNames = snapshot["layers"].get(folderName, (None, {}))
+                if glifFileName in glyphNames:
+                    if layerName not in glyphs:
+                        glyphs[layerName] = set()
+                    glyphs[layerName].add(glyphNames[glifFileName])
+                    break
+        return dict(glyphs=glyphs, fontData=fontData, structure=structure)
+
+    def _updateOperator(self, path, sourceDescriptors, changes):
+        operator = self.operator
+        if operator.mutatorCache is not None:
+            operator.mutatorCache.clearGlyphSets()
+        if changes["structure"]:
+            operator.refreshSourceAvailability([path])
+        changedGlyphNames = set()
+        for glyphNames in changes["glyphs"].values():
+            changedGlyphNames.update(glyphNames)
+        # glyphs that only changed in this ufo, the glyphs in the other sources are kept
+        sourceNames = [sourceDescriptor.name for sourceDescriptor in sourceDescriptors]
+        if changes["structure"]:
+            sourceNames = None
+        for sourceDescriptor in sourceDescriptors:
+            sourceName = sourceDescriptor.name
+            if operator.fonts.isPending(sourceName):
+                # only the glyph names are indexed, the font is read when it is needed
+                if changes["structure"]:
+                    changedGlyphNames.update(operator.fonts.pending[sourceName]["defaultGlyphNames"])
+                    if os.path.exists(path):
+                        operator.fonts.addPending(sourceName, path, sourceDescriptor.layerName)
+                    else:
+                        operator.fonts[sourceName] = None
+                continue
+            if sourceName not in operator.fonts:
+                # not loaded yet
+                continue
+            font = operator.fonts[sourceName]
+            if font is None and not os.path.exists(path):
+                continue
+            if font is None or changes["structure"] or not isinstance(font, defcon.Font):
+                # glyphs or layers were added or removed: read the whole font again
+                if font is not None:
+                    changedGlyphNames.update(font.keys())
+                if os.path.exists(path):
+                    font = operator._instantiateFont(path)
+                    changedGlyphNames.update(font.keys())
+                else:
+                    font = None
+                operator.fonts[sourceName] = font
+                continue
+            layerData = {}
+            for layerName, glyphNames in changes["glyphs"].items():
+                if layerName not in font.layers:
+                    continue
+                layer = font.layers[layerName]
+                # glyphs that have not been read yet will be read when they are needed
+                loadedGlyphNames = [glyphName for glyphName in glyphNames if glyphName in layer._glyphs]
+                if loadedGlyphNames:
+                    layerData[layerName] = dict(glyphNames=loadedGlyphNames)
+            if layerData:
+                font.reloadLayers(dict(layers=layerData))
+            for dataName in changes["fontData"]:
+                getattr(font, f"reload{dataName.capitalize()}")()
+        if changes["structure"]:
+            for pendingSource in operator.fonts.pending.values():
+                if pendingSource["path"] == path:
+                    changedGlyphNames.update(pendingSource["defaultGlyphNames"])
+            operator.glyphNames = operator._collectGlyphNames()
+        for glyphName in changedGlyphNames:
+            operator.glyphChanged(glyphName, includeDependencies=True, sourceNames=sourceNames)
+        if changes["fontData"]:
+            operator.fontDataChanged(*changes["fontData"])
+
+    def run(self, interval=1, callback=None):
+        """ Poll every interval seconds, until stop() is called.
+            This blocks, and the operator is updated in the thread that calls run().
+            callback: called with the changes from poll(), if there are any.
+            It can call stop(), or stop() can be called from another thread.
+        """
+        self._stopped.clear()
+        while not self._stopped.wait(interval):
+            changes = self.poll()
+            if changes and callback is not None:
+                callback(changes)
+
+    def stop(self):
+        self._stopped.set()
@@ -0,0 +1,46 @@
+# microbenchmark for the memoize cache hits in ufoOperator
+# run in regular python, from this folder.
+# Compares the cost of the old immutify keys with the tuple keys,
+# and reports the latency of a cache hit for getGlyphMutator and makeOneGlyph.
+
+import os
+import timeit
+
+from ufoProcessor.ufoOperator import UFOOperator, immutify
+
+path = os.path.join(os.path.dirname(__file__), "ds5.designspace")
+doc = UFOOperator(path, useVarlib=True)
+doc.loadFonts()
+
+glyphName = "glyphOne"
+location = dict(width=612.5, countedItems=2, outlined=1)
+continuousLocation, discreteLocation = doc.splitLocation(location)
+number = 20000
+
+# fill the cache
+doc.getGlyphMutator(glyphName, decomposeComponents=False, discreteLocation=discreteLocation)
+doc.makeOneGlyph(glyphName, location)
+
+
+def oldGlyphMutatorKey():
+    # the way the key was made before
+    argsKeys = ["self", "glyphName", "decomposeComponents"]
+    args = (doc, glyphName)
+    kwargs = dict(decomposeComponents=False, discreteLocation=discreteLocation)
+    return ("getGlyphMutator", immutify(dict(**{key: value for key, value in zip(argsKeys, args)}, **kwargs)))
+
+
+def newGlyphMutatorKey():
+    return UFOOperator.getGlyphMutator.makeKey((doc, glyphName), dict(decomposeComponents=False, discreteLocation=discreteLocation))
+
+
+def report(name, statement):
+    seconds = min(timeit.repeat(statement, number=number, repeat=5))
+    print(f"{name:<40} {1000000 * seconds / number:8.2f} µs per call")
+
+
+# a lookup also hashes the key
+report("getGlyphMutator key, immutify", lambda: hash(oldGlyphMutatorKey()))
+report("getGlyphMutator key, tuple", lambda: hash(newGlyphMutatorKey()))
+report("getGlyphMutator hit", lambda: doc.getGlyphMutator(glyphName, decomposeComponents=False, discreteLocation=discreteLocation))
+report("makeOneGlyph hit", lambda: doc.makeOneGlyph(glyphName, location))
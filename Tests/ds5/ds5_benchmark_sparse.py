@@ -0,0 +1,134 @@
+# benchmark for the zero scalars in the varlib mutators
+# run in regular python, from this folder.
+# The glyphOne masters from ds5 are spread over a number of axes,
+# with masters on the axis extremes and on the corners of each pair of axes.
+# At any location most of the scalars are 0.
+# VariationModel.interpolateFromValuesAndScalars, used by VariationModelMutator,
+# and NumpyVariationModelMutator only add the masters with a scalar that is not 0.
+# This checks that, and compares them with a sum over all the masters.
+
+import os
+import random
+import timeit
+
+from fontMath.mathGlyph import MathGlyph
+from fontTools.designspaceLib import AxisDescriptor
+
+from ufoProcessor.ufoOperator import UFOOperator
+from ufoProcessor.varModels import VariationModelMutator, NumpyVariationModelMutator, ScalarCache
+
+
+class CountingMathGlyph(MathGlyph):
+    # counts the multiplications, the expensive part of the sum
+    multiplications = 0
+
+    def __mul__(self, factor):
+        CountingMathGlyph.multiplications += 1
+        return super(CountingMathGlyph, self).__mul__(factor)
+
+
+def makeCountingGlyph(glyph):
+    # the numpy mutator only flattens MathGlyphs, so count on a copy
+    glyph = glyph.copy()
+    glyph.__class__ = CountingMathGlyph
+    return glyph
+
+
+path = os.path.join(os.path.dirname(__file__), "ds5.designspace")
+doc = UFOOperator(path, useVarlib=True)
+doc.loadFonts()
+sourceGlyphs = [MathGlyph(doc.fonts[sourceDescriptor.name]["glyphOne"]) for sourceDescriptor in doc.findSourceDescriptorsForDiscreteLocation(dict(countedItems=1, outlined=0))]
+
+axisCount = 6
+axes = []
+for axisIndex in range(axisCount):
+    axis = AxisDescriptor()
+    axis.name = f"axis{axisIndex}"
+    axis.minimum = axis.default = 0
+    axis.maximum = 1000
+    axes.append(axis)
+
+masterLocations = [dict()]
+for axisIndex, axis in enumerate(axes):
+    masterLocations.append({axis.name: 500})
+    masterLocations.append({axis.name: 1000})
+    for otherAxis in axes[axisIndex + 1:]:
+        masterLocations.append({axis.name: 1000, otherAxis.name: 1000})
+random.seed(100)
+items = []
+for index, location in enumerate(masterLocations):
+    # compatible masters that are all a bit different
+    items.append((location, sourceGlyphs[index % len(sourceGlyphs)] * (1 + random.random() / 10)))
+
+# slider positions: a few axes move, the others stay at the default
+locations = []
+for i in range(20):
+    location = {axis.name: 0 for axis in axes}
+    for axis in random.sample(axes, 2):
+        location[axis.name] = random.uniform(0, 1000)
+    locations.append(location)
+
+mutator = VariationModelMutator(items, axes, scalarCache=ScalarCache())
+countingMutator = VariationModelMutator([(location, makeCountingGlyph(glyph)) for location, glyph in items], axes, scalarCache=ScalarCache())
+numpyMutator = NumpyVariationModelMutator(items, axes, scalarCache=ScalarCache())
+scalars = [mutator.getLocationScalars(location) for location in locations]
+contributing = [sum(1 for scalar in locationScalars if scalar) for locationScalars in scalars]
+print(f"{len(items)} masters, on average {sum(contributing) / len(locations):.1f} contribute")
+
+for location, count in zip(locations, contributing):
+    # only the masters with a scalar are multiplied
+    CountingMathGlyph.multiplications = 0
+    countingMutator.makeInstance(location)
+    assert CountingMathGlyph.multiplications == count
+    # and only their rows are added
+    values, firstIndex, contributions = numpyMutator.makeInstanceValues(location)
+    assert contributions == count
+    assert numpyMutator.makeInstance(location) == mutator.makeInstance(location)
+
+
+def allMasters():
+    # every master, also the ones with a scalar of 0
+    for locationScalars in scalars:
+        v = None
+        for master, scalar in zip(mutator.masters, locationScalars):
+            contribution = master * scalar
+            if v is None:
+                v = contribution
+            else:
+                v += contribution
+
+
+def skipZeros():
+    for locationScalars in scalars:
+        mutator.model.interpolateFromValuesAndScalars(mutator.masters, locationScalars)
+
+
+def allRowsNumpy():
+    for locationScalars in scalars:
+        values = None
+        for index, scalar in enumerate(locationScalars):
+            contribution = numpyMutator.masterValues[index] * scalar
+            if values is None:
+                values = contribution
+            else:
+                values += contribution
+
+
+def skipZerosNumpy():
+    for locationScalars in scalars:
+        numpyMutator._addRows(locationScalars)
+
+
+def report(name, function, number=20):
+    seconds = min(timeit.repeat(function, number=number, repeat=5))
+    print(f"{name:<40} {1000000 * seconds / (number * len(locations)):8.1f} µs per glyph")
+
+
+# the sums only
+report("MathGlyph, all masters", allMasters)
+report("MathGlyph, skipping zero scalars", skipZeros)
+report("numpy, all rows", allRowsNumpy)
+report("numpy, skipping zero scalars", skipZerosNumpy)
+# with the scalars from the cache
+report("VariationModelMutator.makeInstance", lambda: [mutator.makeInstance(location) for location in locations])
+report("NumpyVariationModelMutator.makeInstance", lambda: [numpyMutator.makeInstance(location) for location in locations])
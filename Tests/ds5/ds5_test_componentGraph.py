@@ -0,0 +1,73 @@
+# test the component graph and the glyph dependencies in ufoOperator
+# run in regular python, from this folder.
+
+import os
+from types import SimpleNamespace
+
+from ufoProcessor.ufoOperator import UFOOperator
+from ufoProcessor.componentGraph import ComponentGraph
+
+# the graph itself
+graph = ComponentGraph.fromReverseComponentMapping(dict(a={"b"}, b={"c"}))
+assert graph.getDependents("a") == {"b", "c"}
+assert graph.getDependents("c") == set()
+graph.updateGlyph("d", ["c"])
+assert graph.getDependents("a") == {"b", "c", "d"}
+graph.updateGlyph("c", [])
+assert graph.getDependents("a") == {"b"}
+assert graph.reverseComponents == dict(a={"b"}, c={"d"})
+# base glyphs, also of components of components
+graph = ComponentGraph.fromReverseComponentMapping(dict(a={"b", "c"}, b={"c"}, c={"d"}))
+assert graph.getBaseGlyphs("d") == {"a", "b", "c"}
+assert graph.getBaseGlyphs("a") == set()
+assert graph.topologicalOrder(["d", "x", "c", "a", "b"]) == ["a", "b", "c", "d", "x"]
+assert graph.findCycles() == []
+# cyclic references do not loop forever
+graph.updateGlyph("a", ["d"])
+graph.updateGlyph("x", ["x"])
+assert graph.getDependents("a") == {"b", "c", "d"}
+assert graph.getBaseGlyphs("a") == {"b", "c", "d"}
+assert sorted(graph.findCycles(), key=len) == [{"x"}, {"a", "b", "c", "d"}]
+assert sorted(graph.topologicalOrder(["d", "c", "b", "a", "x"])) == ["a", "b", "c", "d", "x"]
+
+# dependencies in the designspace
+path = os.path.join(os.path.dirname(__file__), "ds5.designspace")
+doc = UFOOperator(path)
+doc.loadFonts()
+assert doc.getGlyphDependencies("glyphOne") == {"glyphTwo"}
+assert doc.getGlyphDependencies("glyphTwo") == set()
+assert doc.collectBaseGlyphs("glyphTwo", doc.newDefaultLocation()) == ["glyphOne"]
+
+# a new composite in one of the default fonts, the graph follows the edit
+discreteLocation = doc.getDiscreteLocations()[0]
+location = doc.newDefaultLocation(discreteLocation=discreteLocation)
+font = doc.findDefaultFont(discreteLocation=discreteLocation)
+glyph = font.newGlyph("glyphThree")
+pen = glyph.getPointPen()
+pen.addComponent("glyphTwo", (1, 0, 0, 1, 0, 0))
+doc.glyphChanged("glyphThree")
+assert doc.getGlyphDependencies("glyphOne") == {"glyphTwo", "glyphThree"}
+assert doc.getComponentGraph(discreteLocation).topologicalOrder(["glyphThree", "glyphTwo", "glyphOne"]) == ["glyphOne", "glyphTwo", "glyphThree"]
+for glyphName in ["glyphOne", "glyphTwo", "glyphThree"]:
+    doc.makeOneGlyph(glyphName, location)
+assert "glyphThree" in doc.glyphsInCache()
+doc.glyphChanged("glyphOne", includeDependencies=True)
+assert "glyphThree" not in doc.glyphsInCache()
+
+# with lazy loading only the components of the glyph are read, no graph is made
+lazy = UFOOperator(path)
+lazy.loadFonts(lazy=True)
+assert lazy.collectBaseGlyphs("glyphTwo", location) == ["glyphOne"]
+assert lazy._componentGraphs == {}
+# the components are read with a check for cyclic references.
+# defcon glyphs can't refer to each other, so a dict stands in for the font.
+cyclicFont = dict(
+    a=SimpleNamespace(components=[SimpleNamespace(baseGlyph="b")]),
+    b=SimpleNamespace(components=[SimpleNamespace(baseGlyph="c"), SimpleNamespace(baseGlyph="a")]),
+    c=SimpleNamespace(components=[SimpleNamespace(baseGlyph="missing")]),
+)
+assert lazy._readBaseGlyphs(cyclicFont, "a") == {"b", "c", "missing"}
+# when all the sources are loaded the graphs are made
+lazy.getFonts()
+assert lazy.collectBaseGlyphs("glyphTwo", location) == ["glyphOne"]
+assert lazy._componentGraphs != {}
@@ -0,0 +1,95 @@
+# test the incremental generateUFOs in ufoOperator
+# run in regular python, from this folder.
+# Works on a copy of the sources in a temporary folder.
+# After each edit the incremental instances need to be the same
+# as instances generated from scratch, and only the changed files are written.
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import defcon
+
+from ufoProcessor.ufoOperator import UFOOperator
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = tempfile.mkdtemp()
+shutil.copytree(os.path.join(here, "sources"), os.path.join(root, "sources"))
+shutil.copy(os.path.join(here, "ds5.designspace"), root)
+path = os.path.join(root, "ds5.designspace")
+
+
+def readFiles(folder):
+    # the contents of all files, except the digests
+    files = {}
+    for folderPath, folderNames, fileNames in os.walk(folder):
+        for fileName in fileNames:
+            if fileName == UFOOperator.incrementalManifestFileName:
+                continue
+            filePath = os.path.join(folderPath, fileName)
+            with open(filePath, "rb") as f:
+                files[os.path.relpath(filePath, folder)] = (f.read(), os.stat(filePath).st_mtime_ns)
+    return files
+
+
+def generate(folderName, incremental):
+    doc = UFOOperator(path)
+    for instanceDescriptor in doc.doc.instances:
+        instanceDescriptor.path = os.path.join(root, folderName, os.path.basename(instanceDescriptor.path))
+    doc.generateUFOs(incremental=incremental)
+    return readFiles(os.path.join(root, folderName))
+
+
+def compare(expectedChanges):
+    before = readFiles(os.path.join(root, "incremental"))
+    incremental = generate("incremental", True)
+    shutil.rmtree(os.path.join(root, "full"), ignore_errors=True)
+    full = generate("full", False)
+    assert incremental.keys() == full.keys()
+    for fileName, (data, modified) in full.items():
+        assert incremental[fileName][0] == data, fileName
+    changed = set(os.path.basename(fileName) for fileName, (data, modified) in incremental.items() if before.get(fileName, (None, None))[1] != modified)
+    assert changed == expectedChanges, changed
+
+
+try:
+    generate("incremental", True)
+    compare(set())
+    doc = UFOOperator(path)
+    font = defcon.Font(doc.doc.sources[1].path)
+    font["glyphOne"].width += 37
+    font.save()
+    compare({"glyphO_ne.glif"})
+    font.kerning[("glyphOne", "glyphTwo")] = -33
+    font.save()
+    compare({"kerning.plist"})
+
+    # the digests do not depend on the hash seed of the process
+    script = "import sys; from ufoProcessor.ufoOperator import UFOOperator, GlifHashes; doc = UFOOperator(sys.argv[1]); doc.loadFonts(); fontDigest, glyphDigests = doc.getInstanceDigests(doc.doc.instances[0], GlifHashes()); print(fontDigest, sorted(glyphDigests.items()))"
+    digests = set()
+    for seed in range(1, 5):
+        environment = dict(os.environ, PYTHONHASHSEED=str(seed))
+        digests.add(subprocess.check_output([sys.executable, "-c", script, path], env=environment))
+    assert len(digests) == 1
+
+    # unsaved changes in the loaded sources: the instances are made completely
+    def generateEdited(folderName, incremental):
+        doc = UFOOperator(path)
+        doc.loadFonts()
+        for font in doc.fonts.values():
+            font["glyphOne"].width += 300
+        doc.glyphChanged("glyphOne")
+        for instanceDescriptor in doc.doc.instances:
+            instanceDescriptor.path = os.path.join(root, folderName, os.path.basename(instanceDescriptor.path))
+        doc.generateUFOs(incremental=incremental)
+        return readFiles(os.path.join(root, folderName))
+    incremental = generateEdited("incremental", True)
+    shutil.rmtree(os.path.join(root, "full"), ignore_errors=True)
+    full = generateEdited("full", False)
+    assert {fileName: data for fileName, (data, modified) in incremental.items()} == {fileName: data for fileName, (data, modified) in full.items()}
+    # and the next incremental run from the saved sources does not trust the old digests
+    compare({os.path.basename(fileName) for fileName in full})
+finally:
+    shutil.rmtree(root)
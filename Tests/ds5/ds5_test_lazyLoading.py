@@ -0,0 +1,37 @@
+# test lazy loading of the sources in ufoOperator
+# run in regular python, from this folder.
+
+import os
+
+from ufoProcessor.ufoOperator import UFOOperator
+
+path = os.path.join(os.path.dirname(__file__), "ds5.designspace")
+
+eager = UFOOperator(path)
+eager.loadFonts()
+
+lazy = UFOOperator(path)
+lazy.loadFonts(lazy=True)
+# nothing is loaded, but we know the glyphs
+assert len(lazy.fonts.pending) == len(lazy.sources)
+assert len(lazy.fonts.values()) == 0
+assert sorted(lazy.glyphNames) == sorted(eager.glyphNames)
+assert sorted(lazy.collectForegroundLayerNames(), key=str) == sorted(eager.collectForegroundLayerNames(), key=str)
+
+# making a glyph only loads the sources for that discrete location
+location = dict(width=600, countedItems=2, outlined=1)
+continuousLocation, discreteLocation = lazy.splitLocation(location)
+for glyphName in lazy.glyphNames:
+    assert lazy.makeOneGlyph(glyphName, location) == eager.makeOneGlyph(glyphName, location)
+loaded = sorted(lazy.fontLoadTimes.keys())
+assert loaded == sorted([s.name for s in lazy.findSourceDescriptorsForDiscreteLocation(discreteLocation)])
+assert len(lazy.fonts.pending) == len(lazy.sources) - len(loaded)
+
+# info and kerning load the sources they need
+info = lazy.makeOneInfo(location)
+assert info.unitsPerEm == eager.makeOneInfo(location).unitsPerEm
+assert lazy.makeOneKerning(location).items() == eager.makeOneKerning(location).items()
+
+# asking for the fonts loads the rest
+assert len(lazy.getFonts()) == len(eager.getFonts())
+assert len(lazy.fonts.pending) == 0
@@ -0,0 +1,75 @@
+# test the indexed lookups in ufoOperator against a plain search
+# run in regular python, from this folder.
+
+import os
+
+from fontTools.designspaceLib import SourceDescriptor
+
+from ufoProcessor.ufoOperator import UFOOperator
+
+path = os.path.join(os.path.dirname(__file__), "ds5.designspace")
+doc = UFOOperator(path)
+
+
+def searchSources(discreteLocation):
+    return [s for s in doc.doc.sources if all(s.location.get(name) == value for name, value in discreteLocation.items())]
+
+
+# sources by discrete location
+discreteLocations = doc.getDiscreteLocations()
+for discreteLocation in discreteLocations + [{}, dict(outlined=1), dict(countedItems=2, outlined=0, missingAxis=1)]:
+    assert doc.findSourceDescriptorsForDiscreteLocation(discreteLocation) == searchSources(discreteLocation)
+assert doc.findSourceDescriptorsForDiscreteLocation(None) == doc.doc.sources
+# the index follows new sources
+doc.addSource(SourceDescriptor(name="added", path=doc.doc.sources[0].path, location=dict(doc.doc.sources[0].location)))
+doc.addSourceDescriptor(name="addedToo", path=doc.doc.sources[0].path, location=dict(doc.doc.sources[0].location))
+for discreteLocation in discreteLocations:
+    assert doc.findSourceDescriptorsForDiscreteLocation(discreteLocation) == searchSources(discreteLocation)
+# also when the sources are changed directly
+doc.doc.sources.pop()
+for discreteLocation in discreteLocations:
+    assert doc.findSourceDescriptorsForDiscreteLocation(discreteLocation) == searchSources(discreteLocation)
+# a source removed directly and one added with addSource: the same number of sources
+removed = doc.doc.sources.pop(0)
+doc.addSource(SourceDescriptor(name="addedAgain", path=doc.doc.sources[0].path, location=dict(doc.doc.sources[0].location)))
+for discreteLocation in discreteLocations:
+    found = doc.findSourceDescriptorsForDiscreteLocation(discreteLocation)
+    assert found == searchSources(discreteLocation)
+    assert removed not in found
+
+# the axis table
+axisTable = doc.getAxisTable()
+assert doc.getAxisTable() is axisTable
+assert [a.name for a in doc.getOrderedDiscreteAxes()] == [a.name for a in doc.doc.axes if hasattr(a, "values")]
+assert [a.name for a in doc.getOrderedContinuousAxes()] == [a.name for a in doc.doc.axes if not hasattr(a, "values")]
+for axisDescriptor in doc.doc.axes:
+    assert doc.newDefaultLocation(bend=True)[axisDescriptor.name] == axisDescriptor.map_forward(axisDescriptor.default)
+    assert doc.newDefaultLocation()[axisDescriptor.name] == axisDescriptor.default
+assert doc.isLocalDefault(doc.newDefaultLocation(bend=True))
+assert doc.splitLocation(dict(width=100, outlined=1)) == (dict(width=100), dict(outlined=1))
+assert doc.clipDesignLocation(dict(width=(-1000, 2000))) == dict(width=(axisTable.mappedMinimums["width"], axisTable.mappedMaximums["width"]))
+# a new axis makes a new table
+doc.addAxisDescriptor(name="extra", tag="XTRA", minimum=0, default=0, maximum=10)
+assert doc.getAxisTable() is not axisTable
+assert doc.newDefaultLocation()["extra"] == 0
+
+# the source ufos are checked once, not for every glyph
+import ufoProcessor.ufoOperator
+doc = UFOOperator(path)
+doc.loadFonts()
+existsCalls = []
+exists = ufoProcessor.ufoOperator.os.path.exists
+ufoProcessor.ufoOperator.os.path.exists = lambda p: existsCalls.append(p) or exists(p)
+try:
+    for discreteLocation in doc.getDiscreteLocations():
+        for glyphName in doc.glyphNames:
+            doc.collectSourcesForGlyph(glyphName, discreteLocation=discreteLocation)
+    assert existsCalls == []
+    # a missing source is skipped after a refresh
+    sourceDescriptor = doc.findSourceDescriptorsForDiscreteLocation(doc.getDiscreteLocations()[0])[-1]
+    sourceDescriptor.path += ".missing"
+    doc.refreshSourceAvailability([sourceDescriptor.path])
+    assert existsCalls == [sourceDescriptor.path]
+    assert not doc.sourceIsAvailable(sourceDescriptor)
+finally:
+    ufoProcessor.ufoOperator.os.path.exists = exists
@@ -0,0 +1,48 @@
+# test making one glyph at many locations in ufoOperator
+# run in regular python, from this folder.
+# The results need to be the same as makeOneGlyph for each location.
+
+import os
+
+from ufoProcessor.ufoOperator import UFOOperator
+from ufoProcessor.varModels import NumpyVariationModelMutator
+
+path = os.path.join(os.path.dirname(__file__), "ds5.designspace")
+
+for useVarlib in [True, False]:
+    for mutatorClass in [None, NumpyVariationModelMutator]:
+        doc = UFOOperator(path)
+        if mutatorClass is not None:
+            doc.variationModelMutatorClass = mutatorClass
+        doc.loadFonts()
+        locations = [doc.randomLocation(extrapolate=0.1, anisotropic=(i % 5 == 0), roundValues=False) for i in range(100)]
+        # an illegal discrete location
+        locations.append(dict(width=500, countedItems=2, outlined=0.5))
+        for glyphName in doc.glyphNames:
+            results = doc.makeGlyphsAtLocations(glyphName, locations, useVarlib=useVarlib)
+            assert len(results) == len(locations)
+            assert results[-1] is None
+            for location, result in zip(locations, results):
+                assert result == doc.makeOneGlyph(glyphName, location, useVarlib=useVarlib)
+
+# many glyphs at one location share the scalars for their master locations
+doc = UFOOperator(path, useVarlib=True)
+doc.loadFonts()
+font = doc.makeInstance(doc.instances[0])
+scalarCount = len(doc.scalarCache)
+assert 0 < scalarCount < len(font) + 2
+doc.makeInstance(doc.instances[0])
+assert len(doc.scalarCache) == scalarCount
+# and the glyph, info and kerning mutators share the model
+continuousLocation, discreteLocation = doc.splitLocation(doc.instances[0].getFullDesignLocation(doc.doc))
+models = set()
+for glyphName in doc.glyphNames:
+    glyphMutator, unicodes = doc.getGlyphMutator(glyphName, discreteLocation=discreteLocation)
+    models.add(id(glyphMutator.model))
+models.add(id(doc.getInfoMutator(discreteLocation=discreteLocation).model))
+models.add(id(doc.getKerningMutator(discreteLocation=discreteLocation).model))
+assert len(models) == 1
+assert len(doc.modelPool) == 1
+doc.changed()
+assert len(doc.scalarCache) == 0
+assert len(doc.modelPool) == 0
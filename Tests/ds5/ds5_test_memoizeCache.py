@@ -0,0 +1,136 @@
+# test the limits of the memoize cache in ufoOperator
+# run in regular python, from this folder.
+
+import os
+
+import ufoProcessor.ufoOperator
+from ufoProcessor.ufoOperator import UFOOperator, MemoizeCache
+
+# the cache itself
+cache = MemoizeCache(maxEntries=3)
+for i in range(5):
+    cache[("someFunction", i)] = i
+assert len(cache) == 3
+assert ("someFunction", 0) not in cache
+assert ("someFunction", 4) in cache
+# reading an entry makes it recent
+cache[("someFunction", 2)]
+cache[("someFunction", 5)] = 5
+assert ("someFunction", 2) in cache
+assert ("someFunction", 3) not in cache
+assert cache.evictions == 3
+
+# quotas only evict entries of their own function
+cache = MemoizeCache(maxEntries=100, quotas=dict(flood=2))
+cache[("keep", 0)] = "keep this"
+for i in range(50):
+    cache[("flood", i)] = i
+assert ("keep", 0) in cache
+assert cache.countForFunction("flood") == 2
+
+# byte budget
+cache = MemoizeCache(maxBytes=10000)
+for i in range(100):
+    cache[("bytes", i)] = list(range(100))
+assert cache.byteCount <= 10000
+assert len(cache) < 100
+assert len(cache.stats) == len(cache)
+
+# a flood of makeOneGlyph results does not push out the glyph mutators
+path = os.path.join(os.path.dirname(__file__), "ds5.designspace")
+doc = UFOOperator(path, useVarlib=True)
+doc.loadFonts()
+ufoProcessor.ufoOperator.setMemoizeCacheLimits(maxEntries=1000, quotas=dict(makeOneGlyph=20))
+glyphMutatorCount = None
+for i in range(200):
+    location = doc.randomLocation(roundValues=False)
+    for glyphName in ["glyphOne", "glyphTwo"]:
+        doc.makeOneGlyph(glyphName, location)
+    if glyphMutatorCount is None:
+        glyphMutatorCount = ufoProcessor.ufoOperator._memoizeCache.countForFunction("getGlyphMutator")
+assert ufoProcessor.ufoOperator._memoizeCache.countForFunction("makeOneGlyph") == 20
+assert ufoProcessor.ufoOperator._memoizeCache.countForFunction("getGlyphMutator") >= glyphMutatorCount
+print("memoize cache:", len(ufoProcessor.ufoOperator._memoizeCache), "entries", ufoProcessor.ufoOperator._memoizeCache.byteCount, "bytes")
+
+# invalidation uses the index for each operator and glyph
+cache = MemoizeCache()
+cache.store(("getGlyphMutator", "a"), 1, owner="doc1", glyphName="a")
+cache.store(("getGlyphMutator", "b"), 2, owner="doc1", glyphName="b")
+cache.store(("getInfoMutator", "doc1"), 3, owner="doc1")
+cache.store(("getGlyphMutator", "a2"), 4, owner="doc2", glyphName="a")
+cache.removeGlyphs("doc1", ["a"])
+assert ("getGlyphMutator", "a") not in cache
+assert ("getGlyphMutator", "a2") in cache
+assert sorted(cache.glyphNamesForOwner("doc1")) == ["b"]
+cache.removeOwner("doc1")
+assert len(cache) == 1
+assert cache.glyphNamesForOwner("doc1") == []
+
+other = UFOOperator(path, useVarlib=True)
+other.loadFonts()
+location = doc.newDefaultLocation(bend=True)
+for operator in [doc, other]:
+    for glyphName in ["glyphOne", "glyphTwo"]:
+        operator.makeOneGlyph(glyphName, location)
+doc.glyphChanged("glyphOne")
+assert doc.glyphsInCache() == ["glyphTwo"]
+assert other.glyphsInCache() == ["glyphOne", "glyphTwo"]
+doc.changed()
+assert doc.glyphsInCache() == []
+assert other.glyphsInCache() == ["glyphOne", "glyphTwo"]
+
+# the cache does not keep operators alive
+import gc
+import weakref
+ownerCount = len(ufoProcessor.ufoOperator._memoizeCache._ownerKeys)
+operatorReference = weakref.ref(other)
+del other, operator
+gc.collect()
+assert operatorReference() is None
+assert len(ufoProcessor.ufoOperator._memoizeCache._ownerKeys) == ownerCount - 1
+
+# the source MathGlyphs are made again only for the source that changed
+doc = UFOOperator(path, useVarlib=True)
+doc.loadFonts()
+discreteLocation = doc.getDiscreteLocations()[0]
+location = doc.newDefaultLocation(bend=True, discreteLocation=discreteLocation)
+location["width"] = 612.5
+
+
+def sourceMathGlyphs(glyphName):
+    items, _ = doc.collectSourcesForGlyph(glyphName, decomposeComponents=True, discreteLocation=discreteLocation)
+    return {info["sourceName"]: mathGlyph for _, mathGlyph, info in items}
+
+
+result = doc.makeOneGlyph("glyphTwo", location, useVarlib=True)
+before = sourceMathGlyphs("glyphOne")
+composites = sourceMathGlyphs("glyphTwo")
+editedName = sorted(before)[-1]
+doc.fonts[editedName]["glyphOne"].move((0, 100))
+doc.glyphChanged("glyphOne", includeDependencies=True, sourceNames=[editedName])
+after = sourceMathGlyphs("glyphOne")
+for sourceName, mathGlyph in after.items():
+    assert (mathGlyph is before[sourceName]) == (sourceName != editedName)
+# the decomposed glyphTwo uses glyphOne and is made again in the edited source
+for sourceName, mathGlyph in sourceMathGlyphs("glyphTwo").items():
+    assert (mathGlyph is composites[sourceName]) == (sourceName != editedName)
+fresh = UFOOperator(path, useVarlib=True)
+fresh.loadFonts()
+fresh.fonts[editedName]["glyphOne"].move((0, 100))
+assert doc.makeOneGlyph("glyphTwo", location, useVarlib=True) == fresh.makeOneGlyph("glyphTwo", location, useVarlib=True)
+assert doc.makeOneGlyph("glyphTwo", location, useVarlib=True) != result
+# glyphChanged without source names makes all of them again
+doc.glyphChanged("glyphOne")
+assert all(after[sourceName] is not mathGlyph for sourceName, mathGlyph in sourceMathGlyphs("glyphOne").items())
+
+# the shared scalar cache is not counted in the size of the mutators
+import random
+from ufoProcessor.ufoOperator import estimateSize
+doc = UFOOperator(path, useVarlib=True)
+doc.loadFonts()
+glyphMutator, _ = doc.getGlyphMutator("glyphOne", discreteLocation=discreteLocation)
+size = estimateSize(glyphMutator)
+for i in range(2000):
+    glyphMutator.makeInstance(dict(width=random.uniform(0, 1000)))
+assert len(doc.scalarCache) > 1000
+assert estimateSize(glyphMutator) == size
@@ -0,0 +1,105 @@
+# test the mutator cache on disk in ufoOperator
+# run in regular python, from this folder.
+# Works on a copy of the sources in a temporary folder.
+
+import os
+import shutil
+import tempfile
+
+import defcon
+
+from ufoProcessor.ufoOperator import UFOOperator
+from ufoProcessor.mutatorCache import MutatorCache, GlifHashes
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = tempfile.mkdtemp()
+shutil.copytree(os.path.join(here, "sources"), os.path.join(root, "sources"))
+shutil.copy(os.path.join(here, "ds5.designspace"), root)
+path = os.path.join(root, "ds5.designspace")
+cachePath = os.path.join(root, "cache")
+
+try:
+    for useVarlib in [True, False]:
+        location = dict(width=612.5, countedItems=2, outlined=1)
+        continuousLocation, discreteLocation = UFOOperator(path).splitLocation(location)
+
+        def makeGlyphs(useCache):
+            doc = UFOOperator(path, useVarlib=useVarlib)
+            if useCache:
+                doc.mutatorCache = MutatorCache(cachePath)
+            doc.loadFonts()
+            glyphs = {}
+            for glyphName in doc.glyphNames:
+                glyphMutator, unicodes = doc.getGlyphMutator(glyphName, discreteLocation=discreteLocation)
+                glyphs[glyphName] = (glyphMutator.makeInstance(continuousLocation), unicodes)
+            return doc, glyphs
+
+        expected = makeGlyphs(False)[1]
+        doc, glyphs = makeGlyphs(True)
+        assert glyphs == expected
+        assert doc.mutatorCache.hits == 0
+        # a second run reads the mutators from disk
+        doc, glyphs = makeGlyphs(True)
+        assert glyphs == expected
+        assert doc.mutatorCache.misses == 0
+        assert doc.mutatorCache.hits == len(glyphs)
+
+        # change a glyph in a source: only that mutator is made again
+        sourceDescriptor = doc.findSourceDescriptorsForDiscreteLocation(discreteLocation)[-1]
+        font = defcon.Font(sourceDescriptor.path)
+        font["glyphOne"].width += 100
+        font.save()
+        doc, glyphs = makeGlyphs(True)
+        assert doc.mutatorCache.misses == 1
+        assert glyphs["glyphOne"] != expected["glyphOne"]
+        assert glyphs["glyphTwo"] == expected["glyphTwo"]
+        assert makeGlyphs(False)[1] == glyphs
+        font["glyphOne"].width -= 100
+        font.save()
+
+        # an unsaved edit in a loaded source is not written to the cache,
+        # and the cached mutator for the saved glyph is not used
+        doc = UFOOperator(path, useVarlib=useVarlib)
+        doc.mutatorCache = MutatorCache(cachePath)
+        doc.loadFonts()
+        doc.fonts[sourceDescriptor.name]["glyphOne"].width += 500
+        glyphMutator, unicodes = doc.getGlyphMutator("glyphOne", discreteLocation=discreteLocation)
+        assert doc.mutatorCache.hits == doc.mutatorCache.misses == 0
+        assert glyphMutator.makeInstance(continuousLocation) != expected["glyphOne"][0]
+        assert makeGlyphs(True)[1] == expected
+
+    # each .glif is read and hashed once, until the hashes are cleared
+    glifHashes = GlifHashes()
+    glifHash = glifHashes.glifHash(sourceDescriptor.path, None, "glyphOne")
+    assert glifHash is not None
+    assert glifHashes.glifHash(sourceDescriptor.path, "missingLayer", "glyphOne") is None
+    font["glyphOne"].width += 1
+    font.save()
+    assert glifHashes.glifHash(sourceDescriptor.path, None, "glyphOne") == glifHash
+    glifHashes.clear()
+    assert glifHashes.glifHash(sourceDescriptor.path, None, "glyphOne") != glifHash
+    font["glyphOne"].width -= 1
+    font.save()
+
+    # an operator that keeps running: glyphChanged reads the hash of the glyph again
+    doc = UFOOperator(path, useVarlib=True)
+    doc.mutatorCache = MutatorCache(cachePath)
+    doc.loadFonts()
+    before = doc.makeOneGlyph("glyphOne", location, decomposeComponents=False, useVarlib=True)
+    for sourceFont in doc.fonts.values():
+        sourceFont["glyphOne"].width += 200
+    doc.glyphChanged("glyphOne")
+    for sourceFont in doc.fonts.values():
+        sourceFont.save()
+    after = doc.makeOneGlyph("glyphOne", location, decomposeComponents=False, useVarlib=True)
+    fresh = UFOOperator(path, useVarlib=True)
+    fresh.loadFonts()
+    assert after == fresh.makeOneGlyph("glyphOne", location, decomposeComponents=False, useVarlib=True)
+    assert after != before
+    for sourceFont in doc.fonts.values():
+        sourceFont["glyphOne"].width -= 200
+        sourceFont.save()
+    doc.mutatorCache.clear()
+    assert not [fileName for fileName in os.listdir(cachePath) if fileName.endswith(".pickle")]
+finally:
+    shutil.rmtree(root)
@@ -0,0 +1,112 @@
+# test the numpy interpolation engine for the varlib model in ufoOperator
+# run in regular python, from this folder.
+# The numpy results need to be the same as the fontMath results.
+
+import os
+import time
+
+from fontMath.mathGlyph import MathGlyph
+from fontTools.designspaceLib import AxisDescriptor
+
+from ufoProcessor.ufoOperator import UFOOperator
+from ufoProcessor.varModels import VariationModelMutator, NumpyVariationModelMutator, ScalarCache
+
+path = os.path.join(os.path.dirname(__file__), "ds5.designspace")
+
+doc = UFOOperator(path, useVarlib=True)
+doc.loadFonts()
+numpyDoc = UFOOperator(path, useVarlib=True)
+numpyDoc.variationModelMutatorClass = NumpyVariationModelMutator
+numpyDoc.loadFonts()
+
+for i in range(100):
+    location = doc.randomLocation(extrapolate=0.2, roundValues=False)
+    for glyphName in doc.glyphNames:
+        assert doc.makeOneGlyph(glyphName, location, useVarlib=True) == numpyDoc.makeOneGlyph(glyphName, location, useVarlib=True)
+
+# interpolating from the deltas, calculated once for each mutator
+masterResults = {glyphName: doc.makeOneGlyph(glyphName, location, useVarlib=True) for glyphName in doc.glyphNames}
+VariationModelMutator.interpolateFromDeltas = True
+try:
+    doc.changed()
+    numpyDoc.changed()
+    for glyphName in doc.glyphNames:
+        deltaResult = doc.makeOneGlyph(glyphName, location, useVarlib=True)
+        assert deltaResult == numpyDoc.makeOneGlyph(glyphName, location, useVarlib=True)
+        expected = masterResults[glyphName]
+        assert abs(deltaResult.width - expected.width) < 1e-9
+        for deltaContour, contour in zip(deltaResult.contours, expected.contours):
+            for deltaPoint, point in zip(deltaContour["points"], contour["points"]):
+                assert abs(deltaPoint[1][0] - point[1][0]) < 1e-9 and abs(deltaPoint[1][1] - point[1][1]) < 1e-9
+    glyphMutator, unicodes = doc.getGlyphMutator("glyphOne", decomposeComponents=True, discreteLocation=doc.splitLocation(location)[1])
+    glyphMutator.makeInstance(dict(width=612.5))
+    assert glyphMutator.deltas is not None
+finally:
+    VariationModelMutator.interpolateFromDeltas = False
+    doc.changed()
+    numpyDoc.changed()
+
+continuousLocation, discreteLocation = doc.splitLocation(location)
+glyphMutator, unicodes = numpyDoc.getGlyphMutator("glyphOne", discreteLocation=discreteLocation)
+assert isinstance(glyphMutator, NumpyVariationModelMutator)
+assert glyphMutator.masterValues is not None
+
+# incompatible masters go the slow way
+incompatible = MathGlyph(None)
+incompatible.width = incompatible.height = 0
+incompatible.guidelines = [dict(x=0, y=0, angle=0, name=None, identifier=None, color=None)]
+axis = AxisDescriptor()
+axis.name = "weight"
+axis.minimum = axis.default = 0
+axis.maximum = 1000
+m = NumpyVariationModelMutator([(dict(weight=0), incompatible), (dict(weight=1000), incompatible * 2)], [axis])
+assert m.masterValues is None
+assert m.makeInstance(dict(weight=500)) == VariationModelMutator([(dict(weight=0), incompatible), (dict(weight=1000), incompatible * 2)], [axis]).makeInstance(dict(weight=500))
+
+
+# speed with a larger glyph
+def makeGlyph(offset):
+    glyph = MathGlyph(None)
+    glyph.width = 500 + offset
+    glyph.height = 0
+    for contourIndex in range(10):
+        points = [("curve" if i % 3 == 0 else None, (i * 3 + offset, i * 2 - offset), False, None, None) for i in range(60)]
+        glyph.contours.append(dict(identifier=None, points=points))
+    glyph.anchors = [dict(name="top", x=250 + offset, y=700)]
+    return glyph
+
+
+items = [(dict(weight=0), makeGlyph(0)), (dict(weight=500), makeGlyph(10)), (dict(weight=1000), makeGlyph(30))]
+number = 500
+for mutatorClass in [VariationModelMutator, NumpyVariationModelMutator]:
+    m = mutatorClass(items, [axis])
+    start = time.perf_counter()
+    for i in range(number):
+        m.makeInstance(dict(weight=700))
+    print(f"{mutatorClass.__name__:<30} {1000000 * (time.perf_counter() - start) / number:8.1f} µs per glyph")
+start = time.perf_counter()
+for i in range(number):
+    m.makeInstanceValues(dict(weight=700))
+print(f"{'makeInstanceValues':<30} {1000000 * (time.perf_counter() - start) / number:8.1f} µs per glyph")
+assert VariationModelMutator(items, [axis]).makeInstance(dict(weight=700)) == m.makeInstance(dict(weight=700))
+
+# at a master location the master is copied, the result is the same as the interpolation
+for mutatorClass in [VariationModelMutator, NumpyVariationModelMutator]:
+    m = mutatorClass(items, [axis])
+    for location, master in items:
+        assert m.get(m._normalize(location)) is master
+        instance = m.makeInstance(location)
+        assert instance is not master
+        assert instance == m.interpolate(m.getLocationScalars(location))
+    assert m.getMasterInstance(dict(weight=700)) is None
+
+# the master index is cached with the scalars: a cached location is not normalized again
+for mutatorClass in [VariationModelMutator, NumpyVariationModelMutator]:
+    m = mutatorClass(items, [axis], scalarCache=ScalarCache())
+    locations = [location for location, master in items] + [dict(weight=700)]
+    expected = [m.makeInstance(location) for location in locations]
+    normalized = []
+    normalize = m._normalize
+    m._normalize = lambda location: normalized.append(location) or normalize(location)
+    assert [m.makeInstance(location) for location in locations] == expected
+    assert normalized == []
@@ -0,0 +1,90 @@
+# test the SourceObserver with ufoOperator
+# run in regular python, from this folder.
+# The sources are edited in memory, nothing is saved.
+
+import os
+
+import ufoProcessor.ufoOperator
+from ufoProcessor.ufoOperator import UFOOperator
+
+path = os.path.join(os.path.dirname(__file__), "ds5.designspace")
+location = dict(width=612.5, countedItems=2, outlined=1)
+cache = ufoProcessor.ufoOperator._memoizeCache
+
+
+def makeResults(doc):
+    glyphs = {glyphName: doc.makeOneGlyph(glyphName, location, useVarlib=True) for glyphName in sorted(doc.glyphNames)}
+    return glyphs, sorted(doc.makeOneKerning(location).items()), doc.makeOneInfo(location).ascender
+
+
+def editedOperator(edit):
+    # a new operator with the same edit, to compare with
+    fresh = UFOOperator(path, useVarlib=True)
+    fresh.loadFonts()
+    edit(fresh)
+    return fresh
+
+
+doc = UFOOperator(path, useVarlib=True)
+doc.loadFonts()
+doc.startObservingSources()
+makeResults(doc)
+sourceDescriptor = doc.findSourceDescriptorsForDiscreteLocation(doc.splitLocation(location)[1])[-1]
+sourceName = sourceDescriptor.name
+
+# a glyph edit removes the glyph and the glyphs that use it
+def moveGlyph(operator):
+    operator.fonts[sourceName]["glyphOne"].move((0, 100))
+moveGlyph(doc)
+assert "glyphOne" not in doc.glyphsInCache()
+assert "glyphTwo" not in doc.glyphsInCache()
+assert cache.countForFunction("getKerningMutator") == 1
+assert makeResults(doc) == makeResults(editedOperator(moveGlyph))
+
+# kerning and info only clear their own mutators
+def editKerning(operator):
+    moveGlyph(operator)
+    operator.fonts[sourceName].kerning[("glyphOne", "glyphTwo")] = -33
+glyphsInCache = doc.glyphsInCache()
+doc.fonts[sourceName].kerning[("glyphOne", "glyphTwo")] = -33
+assert doc.glyphsInCache() == glyphsInCache
+assert makeResults(doc) == makeResults(editedOperator(editKerning))
+
+def editInfo(operator):
+    editKerning(operator)
+    operator.fonts[sourceName].info.ascender += 100
+doc.fonts[sourceName].info.ascender += 100
+assert doc.glyphsInCache() == glyphsInCache
+assert makeResults(doc) == makeResults(editedOperator(editInfo))
+
+# a new glyph
+def addGlyph(operator):
+    editInfo(operator)
+    operator.fonts[sourceName].newGlyph("glyphNew").width = 300
+    operator.glyphNames = operator._collectGlyphNames()
+doc.fonts[sourceName].newGlyph("glyphNew").width = 300
+assert "glyphNew" in doc.glyphNames
+assert makeResults(doc) == makeResults(editedOperator(addGlyph))
+
+# edits in a layer that no source uses are ignored
+font = doc.fonts[sourceName]
+layer = font.newLayer("unused")
+makeResults(doc)
+glyphsInCache = doc.glyphsInCache()
+layer.newGlyph("glyphOne").width = 10
+assert doc.glyphsInCache() == glyphsInCache
+
+# after stopObservingSources the edits are not seen
+doc.stopObservingSources()
+font["glyphOne"].width += 100
+assert "glyphOne" in doc.glyphsInCache()
+
+# fonts that are loaded later are observed as well
+doc = UFOOperator(path, useVarlib=True)
+doc.loadFonts(lazy=True)
+doc.startObservingSources()
+assert doc.sourceObserver.fonts == {}
+makeResults(doc)
+assert sourceName in doc.sourceObserver.fonts
+doc.fonts[sourceName]["glyphOne"].move((0, 100))
+assert "glyphOne" not in doc.glyphsInCache()
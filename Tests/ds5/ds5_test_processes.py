@@ -0,0 +1,128 @@
+# test making the glyphs of an instance in a number of processes
+# run in regular python, from this folder.
+
+import glob
+import os
+import shutil
+import tempfile
+import warnings
+
+from fontMath.mathGlyph import MathGlyph
+
+from ufoProcessor.ufoOperator import UFOOperator
+from ufoProcessor.varModels import NumpyVariationModelMutator
+
+path = os.path.join(os.path.dirname(__file__), "ds5.designspace")
+
+
+class TestMathGlyph(MathGlyph):
+    pass
+
+
+def readFiles(folder):
+    files = {}
+    for folderPath, folderNames, fileNames in os.walk(folder):
+        for fileName in fileNames:
+            filePath = os.path.join(folderPath, fileName)
+            with open(filePath, "rb") as f:
+                files[os.path.relpath(filePath, folder)] = f.read()
+    return files
+
+
+def generate(designspacePath, folderName, workers=None, edit=None):
+    # generate the instances in folderName, return the files
+    root = os.path.dirname(designspacePath)
+    doc = UFOOperator(designspacePath, useVarlib=True)
+    doc.loadFonts()
+    if edit is not None:
+        edit(doc)
+    for instanceDescriptor in doc.doc.instances:
+        instanceDescriptor.path = os.path.join(root, folderName, os.path.basename(instanceDescriptor.path))
+    doc.generateUFOs(workers=workers)
+    return readFiles(os.path.join(root, folderName))
+
+
+def editGlyph(doc):
+    for font in doc.fonts.values():
+        font["glyphOne"].width += 300
+    doc.glyphChanged("glyphOne")
+
+
+def glyphData(font):
+    return {glyphName: MathGlyph(font[glyphName]) for glyphName in font.keys()}
+
+
+if __name__ == "__main__":
+    doc = UFOOperator(path, useVarlib=True)
+    doc.loadFonts()
+    instanceDescriptor = doc.doc.instances[0]
+    expected = glyphData(doc.makeInstance(instanceDescriptor))
+    assert expected
+    assert glyphData(doc.makeInstance(instanceDescriptor, workers=2)) == expected
+
+    # a source with a font object can not be sent to the processes,
+    # the glyphs are made in this process
+    doc = UFOOperator(path, useVarlib=True)
+    doc.loadFonts()
+    doc.doc.sources[0].font = doc.fonts[doc.doc.sources[0].name]
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        result = doc.makeInstance(instanceDescriptor, workers=2)
+    assert caught
+    assert glyphData(result) == expected
+
+    # unsaved changes: the glyphs are made in this process
+    doc = UFOOperator(path, useVarlib=True)
+    doc.loadFonts()
+    editGlyph(doc)
+    editedExpected = glyphData(doc.makeInstance(instanceDescriptor))
+    assert editedExpected != expected
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        assert glyphData(doc.makeInstance(instanceDescriptor, workers=2)) == editedExpected
+    assert caught
+
+    # the classes set on the operator are used in the processes as well
+    doc = UFOOperator(path, useVarlib=True)
+    doc.variationModelMutatorClass = NumpyVariationModelMutator
+    doc.mathGlyphClass = TestMathGlyph
+    doc.loadFonts()
+    operator = UFOOperator._fromProcessState(doc._getProcessState())
+    assert operator.variationModelMutatorClass is NumpyVariationModelMutator
+    assert operator.mathGlyphClass is TestMathGlyph
+    assert operator.mathInfoClass is doc.mathInfoClass
+    assert glyphData(doc.makeInstance(instanceDescriptor, workers=2)) == expected
+
+    # with debug each process writes its own log, the log of this process is kept
+    root = tempfile.mkdtemp()
+    try:
+        shutil.copytree(os.path.join(os.path.dirname(os.path.abspath(__file__)), "sources"), os.path.join(root, "sources"))
+        shutil.copy(path, root)
+        doc = UFOOperator(os.path.join(root, "ds5.designspace"), useVarlib=True, debug=True)
+        doc.loadFonts()
+        doc.logger.info("marker before the processes")
+        doc.makeInstance(instanceDescriptor, workers=2)
+        with open(os.path.join(root, "ds5_log.txt")) as f:
+            assert "marker before the processes" in f.read()
+        assert glob.glob(os.path.join(root, "ds5_log_*.txt"))
+    finally:
+        shutil.rmtree(root)
+
+    # generateUFOs in processes writes the same files as in this process
+    root = tempfile.mkdtemp()
+    try:
+        shutil.copytree(os.path.join(os.path.dirname(os.path.abspath(__file__)), "sources"), os.path.join(root, "sources"))
+        shutil.copy(path, root)
+        designspacePath = os.path.join(root, "ds5.designspace")
+        serial = generate(designspacePath, "serial")
+        assert serial
+        assert generate(designspacePath, "processes", workers=2) == serial
+        # unsaved changes are not in the files the processes read,
+        # the instances are made in this process
+        serial = generate(designspacePath, "serialEdited", edit=editGlyph)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            assert generate(designspacePath, "processesEdited", workers=2, edit=editGlyph) == serial
+        assert caught
+    finally:
+        shutil.rmtree(root)
@@ -0,0 +1,70 @@
+# test the SourceWatcher with ufoOperator
+# run in regular python, from this folder.
+# Works on a copy of the sources in a temporary folder.
+
+import os
+import shutil
+import tempfile
+
+import defcon
+
+from ufoProcessor.ufoOperator import UFOOperator
+from ufoProcessor.watcher import SourceWatcher
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = tempfile.mkdtemp()
+shutil.copytree(os.path.join(here, "sources"), os.path.join(root, "sources"))
+shutil.copy(os.path.join(here, "ds5.designspace"), root)
+path = os.path.join(root, "ds5.designspace")
+
+location = dict(width=612.5, countedItems=2, outlined=1)
+
+
+def makeResults(doc):
+    doc.loadFonts()
+    glyphs = {glyphName: doc.makeOneGlyph(glyphName, location) for glyphName in sorted(doc.glyphNames)}
+    return glyphs, sorted(doc.makeOneKerning(location).items())
+
+
+try:
+    doc = UFOOperator(path)
+    doc.loadFonts()
+    makeResults(doc)
+    watcher = SourceWatcher(doc)
+    assert watcher.poll() == {}
+    assert "glyphOne" in doc.glyphsInCache()
+
+    # edit a source on disk
+    sourceDescriptor = doc.findSourceDescriptorsForDiscreteLocation(doc.splitLocation(location)[1])[-1]
+    font = defcon.Font(sourceDescriptor.path)
+    font["glyphOne"].width += 100
+    font.kerning[("glyphOne", "glyphTwo")] = -33
+    font.save()
+    changes = watcher.poll()
+    assert changes[sourceDescriptor.path]["glyphs"] == {font.layers.defaultLayer.name: {"glyphOne"}}, changes
+    assert changes[sourceDescriptor.path]["fontData"] == {"kerning"}
+    assert not changes[sourceDescriptor.path]["structure"]
+    assert "glyphOne" not in doc.glyphsInCache()
+    assert makeResults(doc) == makeResults(UFOOperator(path))
+
+    # add a glyph: the font is read again
+    font.newGlyph("glyphNew").width = 300
+    font.save()
+    changes = watcher.poll()
+    assert changes[sourceDescriptor.path]["structure"]
+    assert "glyphNew" in doc.glyphNames
+    assert makeResults(doc) == makeResults(UFOOperator(path))
+
+    # run() polls until the callback stops it
+    font["glyphOne"].width += 100
+    font.save()
+    runChanges = []
+
+    def callback(changes):
+        runChanges.append(changes)
+        watcher.stop()
+    watcher.run(interval=0.01, callback=callback)
+    assert runChanges[0][sourceDescriptor.path]["glyphs"] == {font.layers.defaultLayer.name: {"glyphOne"}}
+    assert makeResults(doc) == makeResults(UFOOperator(path))
+finally:
+    shutil.rmtree(root)